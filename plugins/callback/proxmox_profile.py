@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024, Mikhail Vorontsov (@mephs) <mvorontsov@tuta.io>
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+name: proxmox_profile
+type: aggregate
+short_description: Profile mephs.proxmox tasks across a whole run
+description:
+  - Tracks every C(mephs.proxmox) task, including each item of a loop, with its wall time,
+    target C(api_host), module and result.
+  - At the end of the run, reports totals and percentiles per module and per endpoint.
+  - Flags N+1 patterns, such as an info module looped over many objects with C(name),
+    where a single call without C(name) returns all of them.
+requirements:
+  - Enable in configuration with C(callbacks_enabled).
+options:
+  n_plus_one_threshold:
+    description:
+      - Minimum number of calls of an info module with distinct names against the same endpoint
+        to report it as an N+1 pattern.
+    type: int
+    default: 10
+    env:
+      - name: PROXMOX_PROFILE_N_PLUS_ONE_THRESHOLD
+    ini:
+      - section: callback_proxmox_profile
+        key: n_plus_one_threshold
+author:
+  - Mikhail Vorontsov (@mephs)
+'''
+
+EXAMPLES = r'''
+# ansible.cfg
+# [defaults]
+# callbacks_enabled = mephs.proxmox.proxmox_profile
+#
+# [callback_proxmox_profile]
+# n_plus_one_threshold = 20
+'''
+
+import math
+import time
+from collections import defaultdict
+
+from ansible.plugins.callback import CallbackBase
+
+COLLECTION_PREFIX = 'mephs.proxmox.'
+
+
+def percentile(values, percent):
+    """Return the nearest-rank percentile of the values"""
+    values = sorted(values)
+    return values[max(int(math.ceil(percent / 100.0 * len(values))) - 1, 0)]
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'mephs.proxmox.proxmox_profile'
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, display=None):
+        super(CallbackModule, self).__init__(display=display)
+        self._started = {}
+        self._calls = []
+
+    @staticmethod
+    def _module_name(task):
+        action = getattr(task, 'resolved_action', None) or task.action
+        if action and action.startswith(COLLECTION_PREFIX):
+            return action[len(COLLECTION_PREFIX):]
+        return None
+
+    def v2_runner_on_start(self, host, task):
+        if self._module_name(task) is not None:
+            self._started[(host.get_name(), task._uuid)] = time.monotonic()
+
+    def _record(self, result, status):
+        key = (result._host.get_name(), result._task._uuid)
+        start = self._started.get(key)
+        module = self._module_name(result._task)
+
+        # Loop summaries are already accounted item by item
+        if start is None or module is None or 'results' in result._result:
+            return
+
+        now = time.monotonic()
+        # The next item of a loop starts when this one finishes
+        self._started[key] = now
+
+        args = result._result.get('invocation', {}).get('module_args') or result._task.args
+        api_host = args.get('api_host')
+        if isinstance(api_host, list):
+            api_host = ','.join(api_host)
+
+        if status == 'ok' and result._result.get('changed', False):
+            status = 'changed'
+
+        self._calls.append({
+            'module': module,
+            'endpoint': api_host or 'local',
+            'name': args.get('name'),
+            'status': status,
+            'duration': now - start,
+        })
+
+    def v2_runner_on_ok(self, result):
+        self._record(result, 'ok')
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result, 'failed')
+
+    def v2_runner_on_unreachable(self, result):
+        self._record(result, 'failed')
+
+    def v2_runner_item_on_ok(self, result):
+        self._record(result, 'ok')
+
+    def v2_runner_item_on_failed(self, result):
+        self._record(result, 'failed')
+
+    def _display_summary(self, title, field):
+        groups = defaultdict(list)
+        for call in self._calls:
+            groups[call[field]].append(call)
+
+        self._display.display('%s:' % title)
+        for name, calls in sorted(groups.items(), key=lambda group: -sum(c['duration'] for c in group[1])):
+            durations = [call['duration'] for call in calls]
+            self._display.display(
+                '  %-30s calls=%-6d total=%.2fs p50=%.2fs p95=%.2fs max=%.2fs changed=%d ok=%d failed=%d' % (
+                    name, len(calls), sum(durations), percentile(durations, 50), percentile(durations, 95),
+                    max(durations),
+                    len([c for c in calls if c['status'] == 'changed']),
+                    len([c for c in calls if c['status'] == 'ok']),
+                    len([c for c in calls if c['status'] == 'failed']),
+                )
+            )
+
+    def _display_n_plus_one(self):
+        threshold = self.get_option('n_plus_one_threshold')
+        names = defaultdict(set)
+        for call in self._calls:
+            if call['module'].endswith('_info') and call['name']:
+                names[(call['module'], call['endpoint'])].add(call['name'])
+
+        for (module, endpoint), called in sorted(names.items()):
+            if len(called) >= threshold:
+                self._display.warning(
+                    'N+1 pattern: %s was called for %d distinct names against %s, '
+                    'a single call without name returns all of them' % (module, len(called), endpoint)
+                )
+
+    def v2_playbook_on_stats(self, stats):
+        if not self._calls:
+            return
+
+        self._display.banner('MEPHS.PROXMOX PROFILE')
+        self._display_summary('Per module', 'module')
+        self._display_summary('Per endpoint', 'endpoint')
+        self._display_n_plus_one()
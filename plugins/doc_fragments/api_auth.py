@@ -12,13 +12,44 @@ __metaclass__ = type
 class ModuleDocFragment(object):
     DOCUMENTATION = r'''
 options:
+  api_backend:
+    description:
+      - Backend used to access the Proxmox VE API.
+      - V(https) sends the requests to pveproxy over HTTPS.
+      - V(local) runs C(pvesh) directly, skipping the HTTP stack. The module must run as root on a Proxmox VE node,
+        authentication options are ignored.
+      - V(ssh) runs C(pvesh) on the first node of O(api_host) over SSH. All requests of a task,
+        and of the tasks running within a minute, reuse one multiplexed connection. O(api_user) is the SSH login,
+        a realm suffix such as C(@pam) is ignored. Requires the C(openssh_wrapper) python library.
+      - You can use E(PROXMOX_BACKEND) environment variable.
+    type: str
+    choices: ['https', 'local', 'ssh']
+    default: https
+
   api_host:
     description:
       - Target host of the Proxmox VE cluster.
       - FQDN or IP Address.
-      - You can use E(PROXMOX_HOST) environment variable.
-    type: str
-    required: true
+      - Required if O(api_backend) is V(https) or V(ssh), unless a cassette is replayed.
+      - When several nodes of the cluster are given with O(api_backend=https), they are probed concurrently and the requests
+        are sent to the healthy node with the lowest latency. If that node stops responding,
+        the requests fail over to the next one. A write is only sent again when the connection failed before
+        it was sent, a write interrupted after it was sent fails the task rather than being applied twice.
+      - You can use E(PROXMOX_HOST) environment variable, nodes are separated by commas.
+    type: list
+    elements: str
+
+  api_host_cache_ttl:
+    description:
+      - Number of seconds the node selected from O(api_host) is remembered, so subsequent tasks
+        skip probing the nodes again.
+      - Set to V(0) to probe the nodes on every task.
+      - Only used when O(api_host) contains several nodes.
+      - The cached data is kept in C(ansible-mephs-proxmox-<uid>) in the temporary directory of the host running
+        the module. The module fails if that directory is not owned by the user running it or is accessible
+        to other users.
+    type: int
+    default: 300
 
   api_port:
     description:
@@ -30,21 +61,21 @@ options:
   api_user:
     description:
       - Specify the user for authentication.
+      - Required if O(api_backend) is V(https), unless a cassette is replayed.
       - You can use E(PROXMOX_USER) environment variable.
     type: str
-    required: true
 
   api_password:
     description:
       - Specify the password for authentication.
-      - Either this or O(api_token_id) must be specified.
+      - Either this or O(api_token_id) must be specified if O(api_backend) is V(https).
       - You can use E(PROXMOX_PASSWORD) environment variable.
     type: str
 
   api_token_id:
     description:
       - Specify the token ID.
-      - Either this or O(api_password) must be specified.
+      - Either this or O(api_password) must be specified if O(api_backend) is V(https).
       - Should be used with O(api_token_secret).
       - You can use E(PROXMOX_TOKEN) environment variable.
     type: str
@@ -66,5 +97,66 @@ options:
     default: false
     aliases: ['validate_certs']
 
+  api_compression:
+    description:
+      - Ask the server to compress the responses with gzip or deflate.
+      - The responses are sent uncompressed by the servers not supporting it.
+      - Only applies to the V(https) backend.
+    type: bool
+    default: true
+
+  api_report_transfer:
+    description:
+      - Return the statistics of the API responses of the task in RV(api_transfer).
+      - RV(api_transfer) holds the number of requests C(requests), the number of compressed responses C(compressed),
+        the bytes read from the connection C(transferred_bytes) and the bytes once decompressed C(decoded_bytes).
+      - The responses replayed from a cassette or shared by O(api_single_flight) are not counted.
+    type: bool
+    default: false
+
+  api_single_flight:
+    description:
+      - Coalesce the identical requests sent at the same time by the tasks running on the same host,
+        for example with many forks delegating the same task to C(localhost).
+      - Identical reads are sent once and their response is shared, identical writes are serialized and deduplicated.
+      - Requests are coalesced per backend, nodes, port, user and token, through lock files in a directory private
+        to the user running the module. Shared responses and lock files are removed after a minute.
+      - You can use E(PROXMOX_SINGLE_FLIGHT) environment variable.
+    type: bool
+    default: false
+
+  api_cassette:
+    description:
+      - Path to a cassette file holding the API requests and responses of the task.
+      - Meant for tests and benchmarks, each task should use its own cassette.
+      - With O(api_cassette_mode=record), the task runs against the cluster and every request is saved to the file.
+        Passwords sent to the API are redacted, but responses are saved as is and may contain sensitive data.
+      - With O(api_cassette_mode=replay), no connection is made and the responses are served from the file.
+        The connection and authentication options are not required.
+      - The recorded requests are saved to the file when the task ends.
+      - You can use E(PROXMOX_CASSETTE) environment variable.
+    type: path
+
+  api_cassette_mode:
+    description:
+      - Whether O(api_cassette) is recorded or replayed.
+      - You can use E(PROXMOX_CASSETTE_MODE) environment variable.
+    type: str
+    choices: ['record', 'replay']
+    default: replay
+
+  api_cassette_latency:
+    description:
+      - Number of seconds added to every response replayed from O(api_cassette).
+      - You can use E(PROXMOX_CASSETTE_LATENCY) environment variable.
+    type: float
+    default: 0
+
+  api_cassette_recorded_latency:
+    description:
+      - Wait as long as the recorded request took before serving a response replayed from O(api_cassette).
+    type: bool
+    default: false
+
 requirements: [ 'proxmoxer >= 1.1.0', 'requests' ]
 '''
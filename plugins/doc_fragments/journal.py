@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024, Mikhail Vorontsov (@mephs) <mvorontsov@tuta.io>
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = r'''
+options:
+  journal:
+    description:
+      - Path of the checkpoint journal, on the host running the module.
+      - Each completed operation is appended to the journal under O(run_id). Rerunning the same operation
+        with the same O(run_id) only checks it against a listing read once for all the tasks of the run,
+        instead of reading and comparing the object again.
+      - Operations are journaled per cluster, identified by O(api_backend), O(api_host) and O(api_port),
+        so a journal and O(run_id) can be shared by the tasks of several clusters.
+      - Operations are journaled as soon as they are applied, so a run interrupted by a timeout, a network
+        failure or an Ansible C(async) job exceeding its time limit resumes where it stopped.
+      - Nothing is journaled in check mode.
+    type: path
+  run_id:
+    description:
+      - ID of the run in O(journal), use a new one to apply all the operations again.
+      - Required with O(journal).
+    type: str
+'''
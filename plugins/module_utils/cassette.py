@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024, Mikhail Vorontsov (@mephs) <mvorontsov@tuta.io>
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import atexit
+import json
+import os
+import tempfile
+import time
+
+try:
+    from proxmoxer.core import ProxmoxResource
+except ImportError:
+    # ProxmoxModule reports the missing library
+    pass
+
+CASSETTE_VERSION = 1
+
+# Request parameters that are never written to a cassette
+REDACTED_KEYS = ('password',)
+
+
+class CassetteError(Exception):
+    pass
+
+
+def _redact(values):
+    values = dict((k, v) for k, v in (values or {}).items() if v is not None)
+    for key in values:
+        if any(redacted in key for redacted in REDACTED_KEYS):
+            values[key] = 'VALUE_SPECIFIED_IN_NO_LOG_PARAMETER'
+    return json.loads(json.dumps(values, sort_keys=True, default=str))
+
+
+def _path(url):
+    """Strip the scheme, node and API root, so recordings do not depend on the target"""
+    return url.split('/api2/json', 1)[-1]
+
+
+class CassetteResponse(object):
+    """Response served from a recorded interaction, mimics the responses of the proxmoxer backends"""
+
+    def __init__(self, interaction):
+        self.status_code = interaction['status_code']
+        self.text = interaction['content']
+        self.content = self.text.encode('utf-8')
+        self.headers = {'content-type': 'application/json'}
+        if interaction.get('reason') is not None:
+            self.reason = interaction['reason']
+        if interaction.get('exit_code') is not None:
+            self.exit_code = interaction['exit_code']
+
+
+class Cassette(object):
+    """
+    File holding the request/response pairs of a module run.
+
+    Interactions with the same method, path, parameters and data are served in the order
+    they were recorded, the last one is repeated once all of them are used.
+    """
+
+    def __init__(self, path, backend=None):
+        self.path = path
+        self.backend = backend
+        self.interactions = []
+        self._played = {}
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                content = json.load(f)
+        except (IOError, OSError, ValueError) as e:
+            raise CassetteError('Unable to read cassette %s: %s' % (self.path, e))
+
+        if content.get('version') != CASSETTE_VERSION:
+            raise CassetteError('Unsupported cassette version %s in %s' % (content.get('version'), self.path))
+
+        self.backend = content.get('backend')
+        self.interactions = content.get('interactions', [])
+        return self
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'version': CASSETTE_VERSION, 'backend': self.backend, 'interactions': self.interactions},
+                      f, indent=2, sort_keys=True)
+        os.rename(tmp, self.path)
+
+    def record(self, method, url, params, data, response, elapsed):
+        content = response.content
+        if isinstance(content, bytes):
+            content = content.decode('utf-8', 'replace')
+
+        self.interactions.append({
+            'method': method,
+            'path': _path(url),
+            'params': _redact(params),
+            'data': _redact(data),
+            'status_code': response.status_code,
+            'reason': getattr(response, 'reason', None),
+            'exit_code': getattr(response, 'exit_code', None),
+            'content': content,
+            'elapsed': round(elapsed, 6),
+        })
+
+    def play(self, method, url, params, data):
+        key = (method, _path(url), _redact(params), _redact(data))
+        matches = [i for i in self.interactions if (i['method'], i['path'], i['params'], i['data']) == key]
+        if not matches:
+            raise CassetteError('No recorded interaction for %s %s in %s' % (method, key[1], self.path))
+
+        index = self._played.get(repr(key), 0)
+        self._played[repr(key)] = index + 1
+        return matches[min(index, len(matches) - 1)]
+
+
+class CassetteSession(object):
+    """
+    Session wrapper recording the requests to a cassette, or serving them from it.
+
+    Parameters:
+    - cassette (Cassette): The cassette to record to or replay from.
+    - session (object): The backend session to record, None to replay.
+    - latency (float): Seconds added to every replayed response.
+    - recorded_latency (bool): Also wait as long as the recorded request took.
+
+    Recorded interactions are saved once, when the module exits.
+    """
+
+    def __init__(self, cassette, session=None, latency=0, recorded_latency=False):
+        self.cassette = cassette
+        self.session = session
+        self.latency = latency or 0
+        self.recorded_latency = recorded_latency
+
+        if session is not None:
+            # exit_json and fail_json both leave through sys.exit, which runs the exit handlers
+            atexit.register(cassette.save)
+
+    def request(self, method, url, data=None, params=None, **kwargs):
+        if self.session is None:
+            interaction = self.cassette.play(method, url, params, data)
+            delay = self.latency + (interaction.get('elapsed', 0) if self.recorded_latency else 0)
+            if delay > 0:
+                time.sleep(delay)
+            return CassetteResponse(interaction)
+
+        start = time.monotonic()
+        response = self.session.request(method, url, data=data, params=params, **kwargs)
+        self.cassette.record(method, url, params, data, response, time.monotonic() - start)
+        return response
+
+
+def replay_api(path, latency=0, recorded_latency=False):
+    """Return an API object answering every request from the cassette, without any connection"""
+    cassette = Cassette(path).load()
+
+    if cassette.backend == 'https':
+        from proxmoxer.backends.https import JsonSerializer as serializer
+    else:
+        from proxmoxer.backends.command_base import JsonSimpleSerializer as serializer
+
+    return ProxmoxResource(
+        base_url='https://cassette/api2/json' if cassette.backend == 'https' else '',
+        session=CassetteSession(cassette, latency=latency, recorded_latency=recorded_latency),
+        serializer=serializer(),
+    )
@@ -7,21 +7,40 @@ __metaclass__ = type
 
 def proxmox_auth_argument_spec():
     options = dict(
-        api_host=dict(type='str', fallback=(env_fallback, ['PROXMOX_HOST']), required=True),
+        api_backend=dict(type='str', default='https', choices=['https', 'local', 'ssh'],
+                         fallback=(env_fallback, ['PROXMOX_BACKEND'])),
+        api_host=dict(type='list', elements='str', fallback=(env_fallback, ['PROXMOX_HOST'])),
+        api_host_cache_ttl=dict(type='int', default=300),
         api_port=dict(type='str', default='8006', fallback=(env_fallback, ['PROXMOX_PORT'])),
-        api_user=dict(type='str', fallback=(env_fallback, ['PROXMOX_USER']), required=True),
+        api_user=dict(type='str', fallback=(env_fallback, ['PROXMOX_USER'])),
         api_password=dict(type='str', fallback=(env_fallback, ['PROXMOX_PASSWORD']), no_log=True),
         api_token_id=dict(type='str', fallback=(env_fallback, ['PROXMOX_TOKEN']), no_log=False,
                           aliases=['token_id']),
         api_token_secret=dict(type='str', fallback=(env_fallback, ['PROXMOX_SECRET']), no_log=True,
                               aliases=['token_secret']),
-        api_validate_certs=dict(type='bool', default=False, aliases=['validate_certs'])
+        api_validate_certs=dict(type='bool', default=False, aliases=['validate_certs']),
+        api_compression=dict(type='bool', default=True),
+        api_report_transfer=dict(type='bool', default=False),
+        api_single_flight=dict(type='bool', default=False, fallback=(env_fallback, ['PROXMOX_SINGLE_FLIGHT'])),
+        api_cassette=dict(type='path', fallback=(env_fallback, ['PROXMOX_CASSETTE'])),
+        api_cassette_mode=dict(type='str', default='replay', choices=['record', 'replay'],
+                               fallback=(env_fallback, ['PROXMOX_CASSETTE_MODE'])),
+        api_cassette_latency=dict(type='float', default=0, fallback=(env_fallback, ['PROXMOX_CASSETTE_LATENCY'])),
+        api_cassette_recorded_latency=dict(type='bool', default=False),
     )
     return options
 
 
-def proxmox_auth_required_one_of():
-    return [('api_password', 'api_token_secret')]
+def proxmox_auth_required_if():
+    """
+    Return the connection requirements, checked by ProxmoxModule rather than AnsibleModule,
+    since a replayed cassette needs no connection.
+    """
+    return [
+        ('api_backend', 'https', ('api_host', 'api_user')),
+        ('api_backend', 'https', ('api_password', 'api_token_secret'), True),
+        ('api_backend', 'ssh', ('api_host',)),
+    ]
 
 
 def proxmox_auth_required_together():
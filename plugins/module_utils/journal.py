@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024, Mikhail Vorontsov (@mephs) <mvorontsov@tuta.io>
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import json
+import os
+import time
+
+from .proxmox import read_cache
+from .proxmox import write_cache
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+# Seconds the verification listing is shared by the tasks resuming a run
+VERIFY_TTL = 300
+
+
+class JournalError(Exception):
+    pass
+
+
+class Journal(object):
+    """
+    Append-only file recording the operations completed by a run, one JSON line each.
+
+    An operation is identified by the run ID, the target cluster, the kind and ID of the object
+    and its desired state, so changing the task arguments between two attempts of a run applies
+    it again, and a run shared by several clusters applies it on each of them.
+    Lines are written with fsync once the operation is applied, an interrupted run loses
+    at most the operation in progress.
+    """
+
+    def __init__(self, path, run_id, endpoint):
+        self.path = path
+        self.run_id = run_id
+        self.endpoint = endpoint
+
+    def key(self, kind, objid, spec):
+        operation = [self.run_id, self.endpoint, kind, objid, spec]
+        return hashlib.sha1(json.dumps(operation, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def is_completed(self, kind, objid, spec):
+        try:
+            with open(self.path) as f:
+                content = f.read()
+        except (IOError, OSError):
+            return False
+
+        # Lines are written with sorted keys, a plain search avoids parsing the whole journal on every task
+        return '"key": "%s"' % self.key(kind, objid, spec) in content
+
+    def record(self, kind, objid, spec, changed):
+        line = json.dumps({
+            'changed': changed,
+            'key': self.key(kind, objid, spec),
+            'kind': kind,
+            'objid': objid,
+            'run_id': self.run_id,
+            'time': time.time(),
+        }, sort_keys=True)
+
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                # Forks append to the same journal
+                if HAS_FCNTL:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                os.write(fd, (line + '\n').encode('utf-8'))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except (IOError, OSError) as e:
+            raise JournalError('Unable to write journal %s: %s' % (self.path, e))
+
+    def listing(self, name, fetch):
+        """Return the listing used to verify the completed operations, fetched once for all the tasks of the run"""
+        key = ('journal', os.path.abspath(self.path), self.run_id, self.endpoint, name)
+        data = read_cache(key, VERIFY_TTL)
+        if data is None:
+            data = fetch()
+            write_cache(key, data)
+        return data
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024, Mikhail Vorontsov (@mephs) <mvorontsov@tuta.io>
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from difflib import get_close_matches
+
+from .proxmox import read_cache
+from .proxmox import write_cache
+
+# Privileges are only added by PVE upgrades, so the catalog can be kept for a day
+CATALOG_TTL = 86400
+
+# Privileges known by Proxmox VE 8, used when the Administrator role cannot be read
+PVE_PRIVILEGES = (
+    'Datastore.Allocate',
+    'Datastore.AllocateSpace',
+    'Datastore.AllocateTemplate',
+    'Datastore.Audit',
+    'Group.Allocate',
+    'Mapping.Audit',
+    'Mapping.Modify',
+    'Mapping.Use',
+    'Permissions.Modify',
+    'Pool.Allocate',
+    'Pool.Audit',
+    'Realm.Allocate',
+    'Realm.AllocateUser',
+    'SDN.Allocate',
+    'SDN.Audit',
+    'SDN.Use',
+    'Sys.AccessNetwork',
+    'Sys.Audit',
+    'Sys.Console',
+    'Sys.Incoming',
+    'Sys.Modify',
+    'Sys.PowerMgmt',
+    'Sys.Syslog',
+    'User.Modify',
+    'VM.Allocate',
+    'VM.Audit',
+    'VM.Backup',
+    'VM.Clone',
+    'VM.Config.CDROM',
+    'VM.Config.CPU',
+    'VM.Config.Cloudinit',
+    'VM.Config.Disk',
+    'VM.Config.HWType',
+    'VM.Config.Memory',
+    'VM.Config.Network',
+    'VM.Config.Options',
+    'VM.Console',
+    'VM.Migrate',
+    'VM.Monitor',
+    'VM.PowerMgmt',
+    'VM.Snapshot',
+    'VM.Snapshot.Rollback',
+)
+
+
+def get_privilege_catalog(proxmox_api, version):
+    """
+    Return all privileges known by the given Proxmox VE version.
+
+    The built-in Administrator role holds every privilege, so it is used as the source of truth.
+    The result is cached per version, and the static list is used if the role cannot be read.
+
+    Parameters:
+    - proxmox_api (ProxmoxAPI): The API connection.
+    - version (str): The Proxmox VE version returned by the version endpoint.
+
+    Returns:
+    - list: The privilege names.
+    """
+    cache_key = ('privileges', version)
+    catalog = read_cache(cache_key, CATALOG_TTL)
+
+    if catalog is None:
+        try:
+            catalog = sorted(proxmox_api.access.roles.get('Administrator').keys())
+        except Exception:
+            return list(PVE_PRIVILEGES)
+        write_cache(cache_key, catalog)
+
+    return catalog
+
+
+def normalize_privileges(privs, catalog):
+    """
+    Normalize privileges against the catalog.
+
+    Fixes the case of the privilege names, splits comma separated values and removes duplicates.
+
+    Parameters:
+    - privs (list): The privileges to normalize.
+    - catalog (list): The known privileges.
+
+    Returns:
+    - tuple: A list of normalized privileges and a dict mapping unknown privileges to close matches.
+    """
+    known = dict((priv.lower(), priv) for priv in catalog)
+    normalized = []
+    unknown = {}
+
+    for priv in (item.strip() for value in privs for item in value.split(',')):
+        if not priv:
+            continue
+        if priv.lower() not in known:
+            unknown[priv] = get_close_matches(priv, catalog, n=3)
+        elif known[priv.lower()] not in normalized:
+            normalized.append(known[priv.lower()])
+
+    return normalized, unknown
@@ -10,10 +10,39 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 from ansible.module_utils.basic import missing_required_lib
+from ansible.module_utils.common.validation import check_required_if
+from ansible.module_utils.common.text.converters import to_text
 from ansible.module_utils.compat.version import LooseVersion
+from ansible.module_utils.six.moves.urllib.error import HTTPError
+from ansible.module_utils.urls import open_url
+from concurrent.futures import ThreadPoolExecutor
+import codecs
+import errno
+import hashlib
+import json
+import os
+import re
+import stat
+import tempfile
+import time
 import traceback
 
+from .cassette import Cassette
+from .cassette import CassetteError
+from .cassette import CassetteResponse
+from .cassette import CassetteSession
+from .cassette import replay_api
+from .common_args import proxmox_auth_required_if
+
 PROXMOXER_IMP_ERR = None
+REQUESTS_IMP_ERR = None
+OPENSSH_WRAPPER_IMP_ERR = None
+
+# Seconds to wait for a node to answer the health probe
+PROBE_TIMEOUT = 3
+
+# Bytes read at once from a streamed listing
+STREAM_CHUNK_SIZE = 64 * 1024
 
 try:
     from proxmoxer import ProxmoxAPI
@@ -25,6 +54,41 @@ except ImportError:
     HAS_PROXMOXER = False
     PROXMOXER_IMP_ERR = traceback.format_exc()
 
+try:
+    from requests import Session as requests_session
+    from requests.exceptions import ConnectionError as requests_connection_error
+    from requests.exceptions import ConnectTimeout as requests_connect_timeout
+    from urllib3.exceptions import ConnectTimeoutError as urllib3_connect_timeout_error
+
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+    REQUESTS_IMP_ERR = traceback.format_exc()
+
+try:
+    import openssh_wrapper  # noqa: F401 pylint: disable=unused-import
+
+    HAS_OPENSSH_WRAPPER = True
+except ImportError:
+    HAS_OPENSSH_WRAPPER = False
+    OPENSSH_WRAPPER_IMP_ERR = traceback.format_exc()
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+# Keeps the multiplexed SSH connection open between tasks
+SSH_MULTIPLEX_CONFIG = """Host *
+    ControlMaster auto
+    ControlPath %s
+    ControlPersist 60
+
+Include ~/.ssh/config
+"""
+
 
 def check_list_match(list1, list2):
     """Check if all elements in list1 are present in list2"""
@@ -62,6 +126,444 @@ def ansible_to_proxmox_bool(value):
     return 1 if value else 0
 
 
+def is_already_exists_error(error):
+    """Check if the API refused to create an object because it already exists"""
+    return 'already exists' in to_text(error)
+
+
+def is_does_not_exist_error(error):
+    """Check if the API refused to change an object because it does not exist"""
+    return 'does not exist' in to_text(error)
+
+
+class CacheDirError(Exception):
+    pass
+
+
+def cache_dir():
+    """
+    Return the directory holding the controller-local cache files, private to the current user.
+
+    The directory lives in a shared temporary directory with a predictable name, so it is only used
+    if it is a real directory owned by the current user and not accessible to anybody else.
+    Otherwise the files in it could have been planted by another user.
+    """
+    path = os.path.join(tempfile.gettempdir(), 'ansible-mephs-proxmox-%s' % os.getuid())
+    try:
+        os.mkdir(path, 0o700)
+        # mkdir applies the umask, which may leave less than rwx to the owner
+        os.chmod(path, 0o700)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise CacheDirError('Unable to create cache directory %s: %s' % (path, e))
+
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) != 0o700:
+        raise CacheDirError('Cache directory %s must be a directory owned by uid %s with mode 0700'
+                            % (path, os.getuid()))
+    return path
+
+
+def cache_path(*key):
+    """Return the path of a controller-local cache file identified by key"""
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir(), digest + '.json')
+
+
+def read_cache(key, ttl):
+    """Return the data cached under key, or None if it is missing or older than ttl seconds"""
+    try:
+        with open(cache_path(*key)) as f:
+            entry = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+    if time.time() - entry.get('timestamp', 0) > ttl:
+        return None
+
+    return entry.get('data')
+
+
+def write_cache(key, data):
+    """Atomically store data under key"""
+    path = cache_path(*key)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'timestamp': time.time(), 'data': data}, f)
+        os.rename(tmp, path)
+    except (IOError, OSError):
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def host_url(host, port):
+    """Return the base API url of the given node"""
+    if ':' in host and not host.startswith('['):
+        host = '[%s]' % host
+    return 'https://%s:%s/api2/json' % (host, port)
+
+
+def probe_host(host, port, validate_certs):
+    """
+    Measure how fast a node answers an API request.
+
+    An authentication error still means that pveproxy is up and serving requests,
+    so any HTTP response counts as healthy.
+
+    Returns:
+    - float: The response time in seconds, or None if the node is unreachable.
+    """
+    start = time.monotonic()
+    try:
+        open_url(host_url(host, port) + '/version', timeout=PROBE_TIMEOUT, validate_certs=validate_certs)
+    except HTTPError:
+        pass
+    except Exception:
+        return None
+    return time.monotonic() - start
+
+
+def rank_hosts(hosts, port, validate_certs):
+    """Probe all nodes concurrently and return the healthy ones ordered by latency"""
+    with ThreadPoolExecutor(max_workers=len(hosts)) as executor:
+        latencies = list(executor.map(lambda host: probe_host(host, port, validate_certs), hosts))
+
+    healthy = [(latency, host) for latency, host in zip(latencies, hosts) if latency is not None]
+    return [host for latency, host in sorted(healthy)]
+
+
+class ProxmoxFailoverSession(object):
+    """
+    Session wrapper that moves requests to the next node of the cluster on connection errors.
+
+    Tickets and API tokens are valid on every node of a cluster, so only the target of
+    the request has to be changed. Writes are only moved when the connection failed before
+    they were sent.
+    """
+
+    def __init__(self, session, hosts, port, on_failover=None):
+        self.session = session
+        self.hosts = list(hosts)
+        self.port = port
+        self.on_failover = on_failover
+
+    def __getattr__(self, item):
+        return getattr(self.session, item)
+
+    def _rewrite(self, url):
+        path = url.split('/api2/json', 1)[1]
+        return host_url(self.hosts[0], self.port) + path
+
+    def _failover(self):
+        self.hosts.append(self.hosts.pop(0))
+        # Password authentication renews its ticket against the base url
+        if hasattr(self.session.auth, 'base_url'):
+            self.session.auth.base_url = host_url(self.hosts[0], self.port)
+        if self.on_failover is not None:
+            self.on_failover(self.hosts)
+
+    # Requests that can be sent again when the connection failed after they were sent
+    RETRIED_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    @staticmethod
+    def _not_sent(error):
+        """Whether the connection failed before the request was sent"""
+        if isinstance(error, requests_connect_timeout):
+            return True
+        # Refused connections and unknown hosts are also connect timeouts for urllib3
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(reason, urllib3_connect_timeout_error)
+
+    def request(self, method, url, **kwargs):
+        attempts = len(self.hosts)
+        while True:
+            try:
+                return self.session.request(method, self._rewrite(url), **kwargs)
+            except requests_connection_error as e:
+                attempts -= 1
+                # A write may have been applied before the connection was lost, never send it twice
+                if not attempts or (method.upper() not in self.RETRIED_METHODS and not self._not_sent(e)):
+                    raise
+                self._failover()
+
+
+class ProxmoxTransferSession(object):
+    """
+    Session wrapper counting the bytes of the responses.
+
+    The transferred bytes are read from the connection, before the content is decompressed,
+    the decoded bytes are the size of the content handed over to the serializer.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.stats = {'requests': 0, 'compressed': 0, 'transferred_bytes': 0, 'decoded_bytes': 0}
+
+    def __getattr__(self, item):
+        return getattr(self.session, item)
+
+    def request(self, method, url, **kwargs):
+        response = self.session.request(method, url, **kwargs)
+        decoded = len(response.content or '')
+        raw = getattr(response, 'raw', None)
+        # Only the https backend has a connection to read from, the others transfer the content as it is
+        transferred = raw.tell() if hasattr(raw, 'tell') else decoded
+
+        headers = getattr(response, 'headers', None) or {}
+        self.stats['requests'] += 1
+        self.stats['compressed'] += headers.get('Content-Encoding', 'identity') != 'identity'
+        self.stats['transferred_bytes'] += transferred
+        self.stats['decoded_bytes'] += decoded
+        return response
+
+
+class ProxmoxSingleFlightSession(object):
+    """
+    Session wrapper coalescing the identical requests sent at the same time by the tasks running on this host.
+
+    Identical requests are serialized with a lock file. A request that waited for the lock reuses
+    the response of the identical request completed in the meantime, instead of sending it again:
+    reads share the response, writes are deduplicated. Responses to writes are not kept on disk,
+    so a deduplicated write returns no data.
+
+    Shared responses and lock files are only useful to the requests waiting while they are written,
+    they are removed by the next tasks once older than SHARE_WINDOW.
+    """
+
+    # Seconds the shared responses and lock files are kept
+    SHARE_WINDOW = 60
+
+    def __init__(self, session, identity):
+        self.session = session
+        self.identity = identity
+        self.directory = os.path.join(cache_dir(), 'single-flight')
+        try:
+            os.mkdir(self.directory, 0o700)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+        self._sweep()
+
+    def __getattr__(self, item):
+        return getattr(self.session, item)
+
+    def _sweep(self):
+        expired = time.time() - self.SHARE_WINDOW
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.lstat(path).st_mtime < expired:
+                    os.remove(path)
+            except OSError:
+                # Removed by another task in the meantime
+                pass
+
+    def request(self, method, url, data=None, params=None, **kwargs):
+        key = [to_text(part) for part in (self.identity, method, url,
+                                          sorted((params or {}).items()), sorted((data or {}).items()))]
+        digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+        path = os.path.join(self.directory, digest + '.json')
+        started = time.time()
+
+        with open(path + '.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Keep the lock file from being swept while it is in use
+                os.utime(path + '.lock', None)
+                try:
+                    with open(path) as f:
+                        shared = json.load(f)
+                except (IOError, OSError, ValueError):
+                    shared = None
+
+                if shared is not None and shared['completed'] >= started:
+                    return CassetteResponse(shared)
+
+                response = self.session.request(method, url, data=data, params=params, **kwargs)
+                self._share(path, method, response)
+                return response
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _share(path, method, response):
+        if method == 'GET':
+            if response.status_code >= 500:
+                return
+            content = response.content
+            if isinstance(content, bytes):
+                content = content.decode('utf-8', 'replace')
+        elif 200 <= response.status_code < 300:
+            content = json.dumps({'data': None})
+        else:
+            return
+
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'w') as f:
+            json.dump({
+                'completed': time.time(),
+                'status_code': response.status_code,
+                'reason': getattr(response, 'reason', None),
+                'exit_code': getattr(response, 'exit_code', None),
+                'content': content,
+            }, f)
+        os.rename(tmp, path)
+
+
+def upid_node(upid):
+    """Return the node running the task identified by the UPID"""
+    return upid.split(':')[1]
+
+
+class ProxmoxTaskWaiter(object):
+    """
+    Wait for Proxmox VE tasks to finish.
+
+    All pending tasks are polled together. The polling interval starts short, so quick tasks
+    are reported without delay, and grows while the tasks run without logging anything new.
+    Each poll only fetches the log lines written since the previous one.
+
+    Parameters:
+    - proxmox_api (ProxmoxAPI): The API connection.
+    - timeout (int): Seconds to wait for the tasks to finish.
+    - min_interval (float): First polling interval, in seconds.
+    - max_interval (float): Longest polling interval, in seconds.
+    - on_log (callable): Called with the UPID and the new log lines of a task.
+    """
+
+    # Log lines fetched per request
+    LOG_PAGE = 500
+
+    def __init__(self, proxmox_api, timeout=600, min_interval=0.25, max_interval=5, on_log=None):
+        self.proxmox_api = proxmox_api
+        self.timeout = timeout
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.on_log = on_log
+        self._offsets = {}
+
+    def _task(self, upid):
+        return self.proxmox_api.nodes(upid_node(upid)).tasks(upid)
+
+    def _read_log(self, upid, lines):
+        """Append the new log lines of the task, return whether there were any"""
+        start = len(lines)
+        while True:
+            offset = self._offsets.get(upid, 0)
+            page = self._task(upid).log.get(start=offset, limit=self.LOG_PAGE)
+            # An empty log is reported as a single placeholder line
+            if offset == 0 and len(page) == 1 and page[0].get('t') == 'no content':
+                page = []
+            if page:
+                # Line numbers start at 1, so the last one is the offset of the next line
+                self._offsets[upid] = max(entry['n'] for entry in page)
+            lines.extend(entry['t'] for entry in page)
+            if len(page) < self.LOG_PAGE:
+                break
+
+        if self.on_log is not None and len(lines) > start:
+            self.on_log(upid, lines[start:])
+        return len(lines) > start
+
+    def wait(self, upids):
+        """
+        Wait for the tasks to finish.
+
+        Returns:
+        - dict: The status of each task by UPID, with its exit status, log and whether it timed out.
+        """
+        tasks = dict((upid, {'upid': upid, 'node': upid_node(upid), 'status': 'running', 'exitstatus': None,
+                             'log': [], 'timeout': False}) for upid in upids)
+        pending = list(upids)
+        deadline = time.monotonic() + self.timeout
+        interval = self.min_interval
+
+        while pending:
+            progress = False
+            for upid in list(pending):
+                status = self._task(upid).status.get()
+                progress = self._read_log(upid, tasks[upid]['log']) or progress
+                if status.get('status') == 'stopped':
+                    tasks[upid].update(status='stopped', exitstatus=status.get('exitstatus'))
+                    pending.remove(upid)
+
+            remaining = deadline - time.monotonic()
+            if not pending:
+                break
+            if remaining <= 0:
+                for upid in pending:
+                    tasks[upid]['timeout'] = True
+                break
+
+            interval = self.min_interval if progress else min(interval * 1.5, self.max_interval)
+            time.sleep(min(interval, remaining))
+
+        return tasks
+
+
+def iter_json_items(chunks, key='data'):
+    """
+    Parse the items of the array held by key in a JSON object, one at a time.
+
+    Only the item being parsed is kept in memory, not the whole document. If key does not
+    hold an array, the whole document is parsed: nothing is yielded if key is missing or null,
+    any other value is not a listing and raises ValueError.
+
+    Parameters:
+    - chunks (iterable): The document, as chunks of bytes.
+    - key (str): The key of the array in the top-level object.
+
+    Yields:
+    - The items of the array.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    chunks = iter(chunks)
+    buf = ''
+    pos = None
+    eof = False
+
+    while True:
+        if pos is None:
+            match = start.search(buf)
+            if match:
+                buf, pos = buf[match.end():], 0
+            elif eof:
+                value = json.loads(buf).get(key) if buf.strip() else None
+                if value is not None:
+                    raise ValueError('JSON value %s is not an array' % key)
+                return
+        else:
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buf) and buf[pos] == ']':
+                return
+            if pos < len(buf):
+                try:
+                    item, end = decoder.raw_decode(buf, pos)
+                except ValueError:
+                    end = None
+                # An item is complete once followed by a separator, a number may go on in the next chunk
+                if end is not None and (eof or buf[end:end + 1] in (' ', '\t', '\r', '\n', ',', ']')):
+                    yield item
+                    pos = end
+                    continue
+            if eof:
+                raise ValueError('Truncated JSON array %s' % key)
+
+        # Drop the parsed items only when reading, slicing after each item would copy the buffer over and over
+        if pos:
+            buf, pos = buf[pos:], 0
+        chunk = next(chunks, None)
+        if chunk is None:
+            buf += utf8.decode(b'', final=True)
+            eof = True
+        else:
+            buf += utf8.decode(chunk)
+
+
 class ProxmoxModule(object):
     """Base class for Proxmox modules"""
 
@@ -69,18 +571,119 @@ class ProxmoxModule(object):
         if not HAS_PROXMOXER:
             module.fail_json(msg=missing_required_lib('proxmoxer'), exception=PROXMOXER_IMP_ERR)
 
+        if not HAS_REQUESTS:
+            module.fail_json(msg=missing_required_lib('requests'), exception=REQUESTS_IMP_ERR)
+
         self.module = module
+        self.transfer_session = None
+
         self.proxmoxer_exception = proxmoxer_exception
         self.proxmoxer_version = proxmoxer_version
         self.proxmox_api = self._connect()
         # Test token validity
         try:
-            self.proxmox_api.version.get()
+            self.proxmox_version = self.proxmox_api.version.get()
         except Exception as e:
             module.fail_json(msg='%s' % e, exception=traceback.format_exc())
 
+    def require_cache_dir(self):
+        """
+        Fail unless the cache directory is private to the current user.
+
+        Host rankings, privilege catalogs and shared responses are trusted, so the code paths
+        using the cache check it first, the other ones keep working without it.
+        """
+        try:
+            cache_dir()
+        except CacheDirError as e:
+            self.module.fail_json(msg=to_text(e))
+
+    def api_endpoint(self):
+        """Return the backend, nodes and port of the connection, identifying the target cluster"""
+        return [self.module.params.get('api_backend'), sorted(self.module.params.get('api_host') or []),
+                self.module.params.get('api_port')]
+
     def _connect(self):
-        api_host = self.module.params.get('api_host')
+        api_backend = self.module.params.get('api_backend')
+        cassette = self.module.params.get('api_cassette')
+
+        if cassette and self.module.params.get('api_cassette_mode') == 'replay':
+            return self._connect_cassette(cassette)
+
+        try:
+            # Like AnsibleModule, only count the options that were set
+            check_required_if(proxmox_auth_required_if(),
+                              dict((name, value) for name, value in self.module.params.items() if value is not None))
+        except TypeError as e:
+            self.module.fail_json(msg=to_text(e))
+        if api_backend in ('https', 'ssh') and not self.module.params.get('api_host'):
+            self.module.fail_json(msg='api_host must contain at least one node')
+
+        if api_backend == 'local':
+            proxmox_api = self._connect_local()
+        elif api_backend == 'ssh':
+            proxmox_api = self._connect_ssh()
+        else:
+            proxmox_api = self._connect_https()
+
+        if self.module.params.get('api_report_transfer'):
+            self.transfer_session = ProxmoxTransferSession(proxmox_api._store['session'])
+            proxmox_api._store['session'] = self.transfer_session
+
+        if self.module.params.get('api_single_flight') and HAS_FCNTL:
+            self.require_cache_dir()
+            # The url alone does not tell the clusters apart, the ssh and local backends have no base url
+            identity = self.api_endpoint() + [self.module.params.get('api_user'),
+                                              self.module.params.get('api_token_id')]
+            proxmox_api._store['session'] = ProxmoxSingleFlightSession(proxmox_api._store['session'], identity)
+
+        if cassette:
+            proxmox_api._store['session'] = CassetteSession(
+                Cassette(cassette, backend=api_backend), session=proxmox_api._store['session']
+            )
+
+        return proxmox_api
+
+    def _connect_cassette(self, cassette):
+        try:
+            return replay_api(
+                cassette,
+                latency=self.module.params.get('api_cassette_latency'),
+                recorded_latency=self.module.params.get('api_cassette_recorded_latency'),
+            )
+        except CassetteError as e:
+            self.module.fail_json(msg='%s' % e)
+
+    def _connect_local(self):
+        try:
+            return ProxmoxAPI(backend='local')
+        except Exception as e:
+            self.module.fail_json(msg='%s' % e, exception=traceback.format_exc())
+
+    def _connect_ssh(self):
+        if not HAS_OPENSSH_WRAPPER:
+            self.module.fail_json(msg=missing_required_lib('openssh_wrapper'), exception=OPENSSH_WRAPPER_IMP_ERR)
+
+        api_host = self.module.params.get('api_host')[0]
+        # SSH login is a system user, the realm is meaningless here
+        ssh_user = (self.module.params.get('api_user') or 'root').split('@')[0]
+
+        # Written on every run, an existing file is never trusted: ssh would run its ProxyCommand
+        self.require_cache_dir()
+        directory = cache_dir()
+        config_file = os.path.join(directory, 'ssh_config')
+        fd, tmp = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, 'w') as f:
+            f.write(SSH_MULTIPLEX_CONFIG % os.path.join(directory, 'ssh-%C'))
+        os.rename(tmp, config_file)
+
+        try:
+            return ProxmoxAPI(api_host, backend='openssh', user=ssh_user, config_file=config_file)
+        except Exception as e:
+            self.module.fail_json(msg='%s' % e, exception=traceback.format_exc())
+
+    def _connect_https(self):
+        api_hosts = self.module.params.get('api_host')
         api_port = self.module.params.get('api_port')
         api_user = self.module.params.get('api_user')
         api_password = self.module.params.get('api_password')
@@ -98,7 +701,105 @@ class ProxmoxModule(object):
             auth_args['token_name'] = api_token_id
             auth_args['token_value'] = api_token_secret
 
-        try:
-            return ProxmoxAPI(api_host, port=api_port, verify_ssl=validate_certs, **auth_args)
-        except Exception as e:
-            self.module.fail_json(msg='%s' % e, exception=traceback.format_exc())
+        if len(api_hosts) > 1:
+            api_hosts = self._rank_api_hosts(api_hosts, api_port, validate_certs)
+
+        for api_host in api_hosts:
+            try:
+                proxmox_api = ProxmoxAPI(api_host, port=api_port, verify_ssl=validate_certs, **auth_args)
+                break
+            except requests_connection_error as e:
+                # Node went down after it was probed, try the next one
+                if api_host == api_hosts[-1]:
+                    self.module.fail_json(msg='%s' % e, exception=traceback.format_exc())
+            except Exception as e:
+                self.module.fail_json(msg='%s' % e, exception=traceback.format_exc())
+
+        # Listings of large clusters are several megabytes, they shrink about tenfold once compressed
+        proxmox_api._store['session'].headers['Accept-Encoding'] = (
+            'gzip, deflate' if self.module.params.get('api_compression') else 'identity'
+        )
+
+        if len(api_hosts) > 1:
+            api_hosts = api_hosts[api_hosts.index(api_host):] + api_hosts[:api_hosts.index(api_host)]
+            proxmox_api._store['session'] = ProxmoxFailoverSession(
+                proxmox_api._store['session'], api_hosts, api_port,
+                on_failover=lambda hosts: self._cache_api_hosts(hosts, api_port)
+            )
+
+        return proxmox_api
+
+    def _rank_api_hosts(self, api_hosts, api_port, validate_certs):
+        """Return the healthy nodes ordered by latency, reusing a ranking cached by a previous task"""
+        ttl = self.module.params.get('api_host_cache_ttl')
+        if ttl:
+            self.require_cache_dir()
+        ranking = read_cache(('api_host', sorted(api_hosts), api_port), ttl) if ttl else None
+
+        if not ranking:
+            ranking = rank_hosts(api_hosts, api_port, validate_certs)
+            if not ranking:
+                self.module.fail_json(msg='None of the nodes is reachable: %s' % ', '.join(api_hosts))
+            self._cache_api_hosts(ranking, api_port)
+
+        return ranking
+
+    def _cache_api_hosts(self, ranking, api_port):
+        if self.module.params.get('api_host_cache_ttl'):
+            write_cache(('api_host', sorted(self.module.params.get('api_host')), api_port), ranking)
+
+    def _stream_session(self):
+        """
+        Return the session if the responses can be streamed from it, None otherwise.
+
+        The failover wrapper is kept, so a streamed listing follows the current node of the cluster
+        and moves to the next one on connection errors like any other request.
+        """
+        session = self.proxmox_api._store['session']
+        inner = session.session if isinstance(session, ProxmoxFailoverSession) else session
+        return session if isinstance(inner, requests_session) else None
+
+    def iter_listing(self, resource, predicate=None, fields=None, **params):
+        """
+        Yield the entries of a listing one at a time, filtered and projected.
+
+        The https responses are parsed while they are read, so the memory used is bounded by the
+        entries kept by the caller rather than by the size of the listing. The other backends,
+        the cassettes, api_single_flight and api_report_transfer fall back to a regular request.
+
+        Parameters:
+        - resource: The proxmoxer resource to list, for example self.proxmox_api.access.users.
+        - predicate (callable): Only yield the entries for which it returns True.
+        - fields (list): Only keep these fields of the entries.
+        - params: The query parameters of the listing.
+
+        Yields:
+        - dict: The entries of the listing.
+        """
+        session = self._stream_session()
+        entries = None
+
+        if session is not None:
+            params = dict((name, value) for name, value in params.items() if value is not None)
+            response = session.request('GET', resource._store['base_url'], params=params, stream=True)
+            if response.status_code < 400:
+                entries = iter_json_items(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+            else:
+                # Let proxmoxer raise its usual exception
+                response.close()
+
+        if entries is None:
+            entries = resource.get(**params)
+
+        for entry in entries:
+            if predicate is not None and not predicate(entry):
+                continue
+            if fields is not None:
+                entry = dict((field, entry[field]) for field in fields if field in entry)
+            yield entry
+
+    def exit_json(self, **result):
+        """Exit the module, adding the transfer statistics if they are reported"""
+        if self.transfer_session is not None:
+            result['api_transfer'] = dict(self.transfer_session.stats)
+        self.module.exit_json(**result)
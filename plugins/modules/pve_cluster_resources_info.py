@@ -0,0 +1,195 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024, Mikhail Vorontsov (@mephs) <mvorontsov@tuta.io>
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: pve_cluster_resources_info
+short_description: Retrieve information about Proxmox VE cluster resources
+description:
+  - Retrieve the state of the guests, storage, nodes and SDN zones of the whole cluster with a single request.
+  - Supports returning only the resources that changed since a previous run.
+options:
+  fields:
+    description:
+      - List of fields to return for each resource, for example C(status) or C(node).
+      - The C(id) field is always returned.
+      - If not specified, all fields are returned.
+      - With O(since), only the changes of these fields are detected, so volatile fields such as C(cpu)
+        or C(uptime) should be left out.
+    type: list
+    elements: str
+  since:
+    description:
+      - Snapshot token returned as RV(token) by a previous run.
+      - If specified, only the resources that were added or changed since that run are returned in RV(resources),
+        and the resources that disappeared are returned in RV(removed).
+      - If the token was created with another O(type) or O(fields), all resources are returned.
+    type: str
+  type:
+    description: Type of the resources to retrieve.
+    type: str
+    choices: ['vm', 'storage', 'node', 'sdn']
+extends_documentation_fragment:
+  - mephs.proxmox.api_auth
+  - mephs.proxmox.attributes
+  - mephs.proxmox.attributes.info_module
+author:
+  - Mikhail Vorontsov (@mephs)
+'''
+
+EXAMPLES = r'''
+- name: Get all cluster resources
+  mephs.proxmox.pve_cluster_resources_info:
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+  register: _resources
+
+- name: Get the status of the guests
+  mephs.proxmox.pve_cluster_resources_info:
+    type: vm
+    fields: [vmid, name, node, status]
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+  register: _guests
+
+- name: Get the guests that changed since the previous poll
+  mephs.proxmox.pve_cluster_resources_info:
+    type: vm
+    fields: [vmid, name, node, status]
+    since: "{{ _guests.token }}"
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+  register: _changed_guests
+'''
+
+RETURN = r'''
+incremental:
+  description: Whether RV(resources) only holds the resources changed since O(since).
+  type: bool
+  returned: always
+removed:
+  description: IDs of the resources that disappeared since O(since).
+  type: list
+  elements: str
+  returned: always
+  sample: ['qemu/105']
+resources:
+  description: List of resources.
+  type: list
+  elements: dict
+  returned: always
+  sample: [{'id': 'qemu/100', 'name': 'vm1', 'node': 'node1', 'status': 'running', 'vmid': 100}]
+token:
+  description: Snapshot token to pass as O(since) to the next run.
+  type: str
+  returned: always
+'''
+
+import base64
+import hashlib
+import json
+import zlib
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_bytes
+from ansible.module_utils.common.text.converters import to_text
+from ..module_utils.proxmox import ProxmoxModule
+from ..module_utils.common_args import proxmox_auth_argument_spec
+from ..module_utils.common_args import proxmox_auth_required_together
+
+
+class PVEClusterResourcesInfoModule(ProxmoxModule):
+
+    def __init__(self, module):
+        super().__init__(module)
+        self.type = self.module.params.get('type')
+        self.fields = self.module.params.get('fields')
+        self.since = self.module.params.get('since')
+
+    def iter_resources(self):
+        fields = None if self.fields is None else ['id'] + self.fields
+        return self.iter_listing(self.proxmox_api.cluster.resources, fields=fields, type=self.type)
+
+    @staticmethod
+    def _digest(resource):
+        return hashlib.sha1(to_bytes(json.dumps(resource, sort_keys=True))).hexdigest()[:10]
+
+    def _encode_token(self, digests):
+        snapshot = {'type': self.type, 'fields': self.fields, 'digests': digests}
+        return to_text(base64.urlsafe_b64encode(zlib.compress(to_bytes(json.dumps(snapshot, sort_keys=True)))))
+
+    def _decode_token(self, token):
+        """Return the digests of the snapshot, or None if the token does not match the current query"""
+        try:
+            snapshot = json.loads(to_text(zlib.decompress(base64.urlsafe_b64decode(to_bytes(token)))))
+        except (TypeError, ValueError, zlib.error):
+            self.module.fail_json(msg='Invalid snapshot token in since')
+
+        if snapshot.get('type') != self.type or snapshot.get('fields') != self.fields:
+            return None
+        return snapshot.get('digests')
+
+    def generate_output(self):
+        """
+        Generate a structured output dictionary.
+
+        If a previous snapshot token is given and matches the query, only the resources
+        whose digest changed are returned, along with the IDs of the removed ones.
+
+        Returns:
+        - dict: A dictionary containing the resources, the removed IDs and the new snapshot token.
+        """
+        previous = self._decode_token(self.since) if self.since else None
+        digests = {}
+        resources = []
+
+        # Only the digests and the changed resources are kept while the listing is read
+        try:
+            for resource in self.iter_resources():
+                digests[resource['id']] = self._digest(resource)
+                if previous is None or previous.get(resource['id']) != digests[resource['id']]:
+                    resources.append(resource)
+        except Exception as e:
+            self.module.fail_json(msg=to_text(e))
+
+        output = {'incremental': previous is not None, 'resources': resources, 'removed': [],
+                  'token': self._encode_token(digests)}
+        if previous is not None:
+            output['removed'] = sorted(set(previous) - set(digests))
+
+        return output
+
+
+def main():
+    argument_spec = proxmox_auth_argument_spec()
+    argument_spec.update(
+        type=dict(type='str', choices=['vm', 'storage', 'node', 'sdn']),
+        fields=dict(type='list', elements='str'),
+        since=dict(type='str'),
+    )
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        required_together=proxmox_auth_required_together(),
+        supports_check_mode=True,
+    )
+
+    proxmox = PVEClusterResourcesInfoModule(module)
+    result = proxmox.generate_output()
+
+    proxmox.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -30,6 +30,14 @@ options:
     required: true
     type: str
     aliases: ['groupid']
+  optimistic:
+    description:
+      - Send the create or delete request without reading the group first.
+      - If the group already exists or is already removed, the request is treated as an idempotent outcome.
+      - The group is only read when it already exists and its comment may need an update.
+      - Has no effect in check mode.
+    type: bool
+    default: false
   state:
     description:
       - If V(present) and the group does not exist, creates it.
@@ -41,6 +49,7 @@ options:
 extends_documentation_fragment:
   - mephs.proxmox.api_auth
   - mephs.proxmox.attributes
+  - mephs.proxmox.journal
 author:
   - Mikhail Vorontsov (@mephs)
 '''
@@ -64,6 +73,28 @@ EXAMPLES = r'''
     api_user: root@pam
     api_password: Secret123
 
+- name: Create many groups without reading them first
+  mephs.proxmox.pve_group:
+    name: "{{ item }}"
+    state: present
+    optimistic: true
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+  loop: "{{ tenant_groups }}"
+
+- name: Create many groups, resuming the run if it is interrupted
+  mephs.proxmox.pve_group:
+    name: "{{ item.name }}"
+    comment: "{{ item.comment }}"
+    journal: /var/tmp/rbac.journal
+    run_id: "{{ rbac_release }}"
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+  loop: "{{ rbac_groups }}"
+  delegate_to: localhost
+
 - name: Remove a group
   mephs.proxmox.pve_group:
     name: group1
@@ -74,6 +105,10 @@ EXAMPLES = r'''
 '''
 
 RETURN = r'''
+journaled:
+  description: Whether the operation was completed by a previous attempt of the run and only verified.
+  type: bool
+  returned: if O(journal) is specified
 state:
   description: State of the group.
   type: str
@@ -97,8 +132,11 @@ group:
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.common.text.converters import to_text
 from ..module_utils.proxmox import ProxmoxModule
+from ..module_utils.proxmox import is_already_exists_error
+from ..module_utils.proxmox import is_does_not_exist_error
+from ..module_utils.journal import Journal
+from ..module_utils.journal import JournalError
 from ..module_utils.common_args import proxmox_auth_argument_spec
-from ..module_utils.common_args import proxmox_auth_required_one_of
 from ..module_utils.common_args import proxmox_auth_required_together
 
 
@@ -108,7 +146,14 @@ class PVERoleModule(ProxmoxModule):
         super().__init__(module)
         self.groupid = self.module.params.get('name')
         self.comment = self.module.params.get('comment')
+        self.optimistic = self.module.params.get('optimistic') and not self.module.check_mode
         self.state = self.module.params.get('state')
+        self.journal = None
+
+        if self.module.params.get('journal'):
+            self.require_cache_dir()
+            self.journal = Journal(self.module.params.get('journal'), self.module.params.get('run_id'),
+                                   self.api_endpoint())
 
     def _generate_output(self, changed=False):
         """
@@ -129,6 +174,54 @@ class PVERoleModule(ProxmoxModule):
             output['group'].update(comment=self.comment)
         return output
 
+    def _journal_spec(self):
+        if self.state == 'absent':
+            return {'state': self.state}
+        return {'state': self.state, 'comment': self.comment}
+
+    def resume_group(self):
+        """
+        Verify an operation completed by a previous attempt of the run.
+
+        Returns:
+        - dict: The output of the operation, or None if it has to be applied.
+        """
+        if self.journal is None or not self.journal.is_completed('group', self.groupid, self._journal_spec()):
+            return None
+
+        try:
+            groups = self.journal.listing('groups', lambda: dict(
+                (group['groupid'], group.get('comment', '')) for group in self.proxmox_api.access.groups.get()
+            ))
+        except Exception as e:
+            self.module.fail_json(msg=to_text(e), groupid=self.groupid)
+
+        if self.state == 'absent':
+            verified = self.groupid not in groups
+        else:
+            verified = self.groupid in groups and groups[self.groupid] == self.comment
+
+        if not verified:
+            return None
+
+        output = self._generate_output(changed=False)
+        output['journaled'] = True
+        return output
+
+    def checkpoint_group(self, output):
+        """Journal the completed operation"""
+        if self.journal is None:
+            return output
+
+        if not self.module.check_mode and not output.get('journaled'):
+            try:
+                self.journal.record('group', self.groupid, self._journal_spec(), output['changed'])
+            except JournalError as e:
+                self.module.fail_json(msg=to_text(e), groupid=self.groupid)
+
+        output.setdefault('journaled', False)
+        return output
+
     def _get_group(self, groupid):
         try:
             return self.proxmox_api.access.groups.get(groupid)
@@ -138,6 +231,11 @@ class PVERoleModule(ProxmoxModule):
             self.module.fail_json(groupid=groupid, msg=to_text(e))
 
     def present_group(self):
+        if self.optimistic:
+            created = self._try_create_group()
+            if created is not None:
+                return created
+
         group = self._get_group(self.groupid)
 
         if group is None:
@@ -157,6 +255,17 @@ class PVERoleModule(ProxmoxModule):
 
         return self._generate_output(changed=True)
 
+    def _try_create_group(self):
+        """Create the group without reading it first, return None if it already exists"""
+        try:
+            self.proxmox_api.access.groups.post(groupid=self.groupid, comment=self.comment)
+        except Exception as e:
+            if is_already_exists_error(e):
+                return None
+            self.module.fail_json(msg=to_text(e), groupid=self.groupid)
+
+        return self._generate_output(changed=True)
+
     def _update_group(self):
         if not self.module.check_mode:
             try:
@@ -167,6 +276,9 @@ class PVERoleModule(ProxmoxModule):
         return self._generate_output(changed=True)
 
     def absent_group(self):
+        if self.optimistic:
+            return self._try_delete_group()
+
         group = self._get_group(self.groupid)
 
         if group is not None:
@@ -180,31 +292,49 @@ class PVERoleModule(ProxmoxModule):
 
         return self._generate_output(changed=False)
 
+    def _try_delete_group(self):
+        """Delete the group without reading it first"""
+        try:
+            self.proxmox_api.access.groups(self.groupid).delete()
+        except Exception as e:
+            if is_does_not_exist_error(e):
+                return self._generate_output(changed=False)
+            self.module.fail_json(msg=to_text(e), groupid=self.groupid)
+
+        return self._generate_output(changed=True)
+
 
 def main():
     argument_spec = proxmox_auth_argument_spec()
     argument_spec.update(
         name=dict(type='str', required=True, aliases=['groupid']),
         comment=dict(type='str', default=''),
-        state=dict(type='str', default='present', choices=['present', 'absent'])
+        optimistic=dict(type='bool', default=False),
+        state=dict(type='str', default='present', choices=['present', 'absent']),
+        journal=dict(type='path'),
+        run_id=dict(type='str'),
     )
 
     module = AnsibleModule(
         argument_spec=argument_spec,
-        required_one_of=proxmox_auth_required_one_of(),
-        required_together=proxmox_auth_required_together(),
+        required_together=proxmox_auth_required_together() + [('journal', 'run_id')],
         supports_check_mode=True
     )
 
     proxmox = PVERoleModule(module)
     state = module.params.get('state')
 
-    if state == 'absent':
-        result = proxmox.absent_group()
-    else:
-        result = proxmox.present_group()
+    result = proxmox.resume_group()
+
+    if result is None:
+        if state == 'absent':
+            result = proxmox.absent_group()
+        else:
+            result = proxmox.present_group()
+
+    result = proxmox.checkpoint_group(result)
 
-    module.exit_json(**result)
+    proxmox.exit_json(**result)
 
 
 if __name__ == '__main__':
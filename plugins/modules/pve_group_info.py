@@ -16,6 +16,12 @@ short_description: Retrieve information about Proxmox VE groups
 description:
   - Retrieve information about Proxmox VE groups.
 options:
+  indexes:
+    description:
+      - Also return reverse indexes computed from the list of groups, see RV(groups_by_member).
+      - Only applies if O(name) is not specified.
+    type: bool
+    default: false
   name:
     description: Name of the group to be retrieved.
     type: str
@@ -43,6 +49,18 @@ EXAMPLES = r'''
     api_user: root@pam
     api_password: Secret123
   register: _custom_group_details
+
+- name: Get the groups of each user
+  mephs.proxmox.pve_group_info:
+    indexes: true
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+  register: _proxmox_groups
+
+- name: Show the groups of a user
+  ansible.builtin.debug:
+    msg: "{{ _proxmox_groups.groups_by_member['john@pve'] | default([]) }}"
 '''
 
 RETURN = r'''
@@ -71,13 +89,18 @@ groups:
       type: list
       elements: str
       returned: on success
+groups_by_member:
+  description: Names of the groups of each user.
+  type: dict
+  returned: if O(indexes=true) and O(name) is not specified
+  sample: {'john@pve': ['admins', 'operators']}
 '''
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.common.text.converters import to_text
 from ..module_utils.proxmox import ProxmoxModule
+from ..module_utils.proxmox import string_to_list
 from ..module_utils.common_args import proxmox_auth_argument_spec
-from ..module_utils.common_args import proxmox_auth_required_one_of
 from ..module_utils.common_args import proxmox_auth_required_together
 
 
@@ -85,6 +108,7 @@ class PVEGroupInfoModule(ProxmoxModule):
 
     def __init__(self, module):
         super().__init__(module)
+        self.indexes = self.module.params.get('indexes')
 
     @staticmethod
     def generate_output(groupid=None, users=None, comment=None, groups=None):
@@ -130,21 +154,34 @@ class PVEGroupInfoModule(ProxmoxModule):
 
     def get_all_groups(self):
         try:
-            groups = self.proxmox_api.access.groups.get()
-            return self.generate_output(groups=[group for group in groups])
+            groups = list(self.iter_listing(self.proxmox_api.access.groups))
         except Exception as e:
             self.module.fail_json(msg=to_text(e))
 
+        output = self.generate_output(groups=groups)
+        if self.indexes:
+            output['groups_by_member'] = self._index_members(groups)
+        return output
+
+    @staticmethod
+    def _index_members(groups):
+        """Map each user to the groups it is a member of"""
+        index = {}
+        for group in groups:
+            for user in string_to_list(group.get('users')):
+                index.setdefault(user, []).append(group['groupid'])
+        return dict((user, sorted(groupids)) for user, groupids in index.items())
+
 
 def main():
     argument_spec = proxmox_auth_argument_spec()
     argument_spec.update(
         name=dict(type='str', aliases=['groupid']),
+        indexes=dict(type='bool', default=False),
     )
 
     module = AnsibleModule(
         argument_spec=argument_spec,
-        required_one_of=proxmox_auth_required_one_of(),
         required_together=proxmox_auth_required_together(),
         supports_check_mode=True,
     )
@@ -157,7 +194,7 @@ def main():
     else:
         result = proxmox.get_all_groups()
 
-    module.exit_json(**result)
+    proxmox.exit_json(**result)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,244 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024, Mikhail Vorontsov (@mephs) <mvorontsov@tuta.io>
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: pve_permission_info
+short_description: Check the effective permissions of Proxmox VE users and API tokens
+description:
+  - Retrieve the effective privileges of Proxmox VE users and API tokens on many paths.
+  - The full permission tree of each principal is fetched once, then the paths are resolved locally,
+    inheriting the propagated privileges of the nearest parent path.
+  - The tree leaves out the paths where the principal has no privileges, for example because of a C(NoAccess) ACL,
+    and pool members also get the privileges granted on their pool. The ACLs and the members of the pools with an ACL
+    are read once, the paths with an ACL or in such a pool, and the paths below them, are checked one by one.
+options:
+  paths:
+    description: List of paths to check, for example V(/vms/100) or V(/storage/local).
+    type: list
+    elements: str
+    required: true
+  principals:
+    description:
+      - List of users and API tokens to check.
+      - Users are specified as C(name@realm), API tokens as C(name@realm!tokenid).
+    type: list
+    elements: str
+    required: true
+    aliases: ['userids']
+  role:
+    description:
+      - Name of the role to compare the privileges with, see RV(permissions[].missing).
+    type: str
+    aliases: ['roleid']
+extends_documentation_fragment:
+  - mephs.proxmox.api_auth
+  - mephs.proxmox.attributes
+  - mephs.proxmox.attributes.info_module
+author:
+  - Mikhail Vorontsov (@mephs)
+'''
+
+EXAMPLES = r'''
+- name: Check what an automation token can do on some guests
+  mephs.proxmox.pve_permission_info:
+    principals:
+      - automation@pve!deploy
+    paths:
+      - /vms/100
+      - /vms/101
+      - /storage/local
+    role: deploy_role
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+  register: _permissions
+
+- name: Show the paths lacking the role privileges
+  ansible.builtin.debug:
+    msg: "{{ _permissions.permissions | rejectattr('allowed') | map(attribute='path') }}"
+'''
+
+RETURN = r'''
+permissions:
+  description: Effective privileges of each principal on each path.
+  type: list
+  elements: dict
+  returned: always
+  contains:
+    allowed:
+      description: Whether the principal holds all the privileges of O(role) on the path.
+      type: bool
+      returned: if O(role) is specified
+    missing:
+      description: Privileges of O(role) the principal does not hold on the path.
+      type: list
+      elements: str
+      returned: if O(role) is specified
+    path:
+      description: Path.
+      type: str
+      returned: always
+      sample: '/vms/100'
+    principal:
+      description: User or API token.
+      type: str
+      returned: always
+      sample: 'automation@pve!deploy'
+    privs:
+      description: Privileges held by the principal on the path.
+      type: list
+      elements: str
+      returned: always
+      sample: ['VM.Audit', 'VM.Console']
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_text
+from ..module_utils.proxmox import ProxmoxModule
+from ..module_utils.proxmox import proxmox_to_ansible_bool
+from ..module_utils.common_args import proxmox_auth_argument_spec
+from ..module_utils.common_args import proxmox_auth_required_together
+
+
+class PVEPermissionInfoModule(ProxmoxModule):
+
+    def __init__(self, module):
+        super().__init__(module)
+        self.principals = self.module.params.get('principals')
+        self.paths = [self._normalize_path(path) for path in self.module.params.get('paths')]
+        self.role = self.module.params.get('role')
+
+    @staticmethod
+    def _normalize_path(path):
+        return '/' + '/'.join(part for part in path.split('/') if part)
+
+    @staticmethod
+    def _parents(path):
+        """Yield the parents of a path, nearest first"""
+        while path != '/':
+            path = path.rsplit('/', 1)[0] or '/'
+            yield path
+
+    @classmethod
+    def resolve(cls, tree, path, evaluated):
+        """
+        Resolve the privileges on a path from a permission tree.
+
+        The paths carrying ACLs and the pool members are evaluated by Proxmox VE on their own, and left out
+        of the tree when they grant nothing. If such a path is met before a path of the tree, the privileges
+        cannot be told from the tree.
+
+        Parameters:
+        - tree (dict): Mapping of paths to privileges and their propagate flag,
+          as returned by the access/permissions endpoint.
+        - path (str): The normalized path.
+        - evaluated (set): The paths carrying ACLs and the pool members.
+
+        Returns:
+        - list: The sorted privileges on the path, or None if they have to be read from the API.
+        """
+        if path in tree:
+            return sorted(tree[path])
+        if path in evaluated:
+            return None
+
+        for parent in cls._parents(path):
+            if parent in tree:
+                return sorted(priv for priv, propagate in tree[parent].items()
+                              if proxmox_to_ansible_bool(propagate))
+            if parent in evaluated:
+                return None
+        return []
+
+    def get_evaluated_paths(self):
+        """Return the paths carrying ACLs and the members of the pools carrying ACLs"""
+        try:
+            paths = set(self._normalize_path(acl['path']) for acl in self.proxmox_api.access.acl.get())
+            # Only the pools with an ACL grant privileges to their members. The cluster resources
+            # listing has no pool for storage, which can be a member of several pools.
+            for path in sorted(paths):
+                if not path.startswith('/pool/'):
+                    continue
+                for member in self.proxmox_api.pools(path[len('/pool/'):]).get().get('members', []):
+                    if member.get('type') in ('qemu', 'lxc'):
+                        paths.add('/vms/%s' % member['vmid'])
+                    elif member.get('type') == 'storage':
+                        paths.add('/storage/%s' % member['storage'])
+        except Exception as e:
+            self.module.fail_json(msg=to_text(e))
+
+        return paths
+
+    def get_role_privs(self):
+        try:
+            return set(self.proxmox_api.access.roles.get(self.role).keys())
+        except self.proxmoxer_exception as e:
+            self.module.fail_json(roleid=self.role, msg='Failed to get role: %s' % to_text(e))
+        except Exception as e:
+            self.module.fail_json(roleid=self.role, msg=to_text(e))
+
+    def get_tree(self, principal):
+        try:
+            return self.proxmox_api.access.permissions.get(userid=principal)
+        except Exception as e:
+            self.module.fail_json(principal=principal, msg=to_text(e))
+
+    def get_path_privs(self, principal, path):
+        try:
+            perms = self.proxmox_api.access.permissions.get(userid=principal, path=path)
+        except Exception as e:
+            self.module.fail_json(principal=principal, path=path, msg=to_text(e))
+
+        return sorted(next(iter(perms.values()), {})) if perms else []
+
+    def check_permissions(self):
+        role_privs = self.get_role_privs() if self.role else None
+        evaluated = self.get_evaluated_paths()
+
+        permissions = []
+        for principal in self.principals:
+            tree = dict((self._normalize_path(path), privs) for path, privs in self.get_tree(principal).items())
+            for path in self.paths:
+                privs = self.resolve(tree, path, evaluated)
+                if privs is None:
+                    privs = self.get_path_privs(principal, path)
+                permission = {'principal': principal, 'path': path, 'privs': privs}
+                if role_privs is not None:
+                    permission['missing'] = sorted(role_privs.difference(privs))
+                    permission['allowed'] = not permission['missing']
+                permissions.append(permission)
+
+        return {'permissions': permissions}
+
+
+def main():
+    argument_spec = proxmox_auth_argument_spec()
+    argument_spec.update(
+        principals=dict(type='list', elements='str', required=True, aliases=['userids']),
+        paths=dict(type='list', elements='str', required=True),
+        role=dict(type='str', aliases=['roleid']),
+    )
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        required_together=proxmox_auth_required_together(),
+        supports_check_mode=True,
+    )
+
+    proxmox = PVEPermissionInfoModule(module)
+    result = proxmox.check_permissions()
+
+    proxmox.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
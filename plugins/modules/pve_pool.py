@@ -0,0 +1,348 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024, Mikhail Vorontsov (@mephs) <mvorontsov@tuta.io>
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: pve_pool
+short_description: Manage Proxmox VE resource pools
+description:
+  - Allows to create, modify or remove many Proxmox VE resource pools and their members at once.
+  - The pools and their guest members are read with two listings, whatever the number of pools.
+    A storage can be a member of several pools, so the storage members are read with one request per pool,
+    only for the pools managing their storage or being removed.
+  - Each pool then converges with at most one request adding members and one request removing them.
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: none
+options:
+  allow_move:
+    description:
+      - Move guests to their pool even if they are already members of another pool.
+      - If V(false), adding a guest that is a member of another pool fails.
+    type: bool
+    default: false
+  exclusive:
+    description:
+      - Remove the members not listed in O(pools[].vms) and O(pools[].storage).
+      - Only applies to the member types specified for the pool.
+    type: bool
+    default: false
+  pools:
+    description: List of pools to manage.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      comment:
+        description:
+          - Comment of the pool.
+          - If not specified, the comment is not managed.
+        type: str
+      poolid:
+        description: Name of the pool.
+        type: str
+        required: true
+        aliases: ['name']
+      state:
+        description:
+          - If V(present) and the pool does not exist, creates it.
+          - If V(present) and the pool exists, does nothing or updates it.
+          - If V(absent), removes the pool, after removing its members.
+        type: str
+        choices: ['present', 'absent']
+        default: present
+      storage:
+        description:
+          - List of storage members of the pool.
+          - If not specified, the storage members are not managed.
+        type: list
+        elements: str
+      vms:
+        description:
+          - List of guest IDs members of the pool.
+          - If not specified, the guest members are not managed.
+        type: list
+        elements: int
+extends_documentation_fragment:
+  - mephs.proxmox.api_auth
+  - mephs.proxmox.attributes
+author:
+  - Mikhail Vorontsov (@mephs)
+'''
+
+EXAMPLES = r'''
+- name: Create tenant pools with their members
+  mephs.proxmox.pve_pool:
+    pools:
+      - poolid: tenant1
+        comment: Tenant 1
+        vms: [100, 101, 102]
+        storage: [tenant1-data]
+      - poolid: tenant2
+        vms: [200, 201]
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+
+- name: Make the pool contain exactly the given guests
+  mephs.proxmox.pve_pool:
+    pools:
+      - poolid: tenant1
+        vms: "{{ range(100, 400) | list }}"
+    exclusive: true
+    allow_move: true
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+
+- name: Remove a pool
+  mephs.proxmox.pve_pool:
+    pools:
+      - poolid: tenant2
+        state: absent
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+'''
+
+RETURN = r'''
+pools:
+  description: Pools current status.
+  type: list
+  elements: dict
+  returned: always
+  contains:
+    added:
+      description: Members added to the pool.
+      type: dict
+      returned: always
+      sample: {'vms': [100], 'storage': []}
+    changed:
+      description: Whether the pool was changed.
+      type: bool
+      returned: always
+    comment:
+      description: Comment of the pool.
+      type: str
+      returned: if O(pools[].state=present)
+    poolid:
+      description: Pool name.
+      type: str
+      returned: always
+    removed:
+      description: Members removed from the pool.
+      type: dict
+      returned: always
+      sample: {'vms': [], 'storage': ['local']}
+    state:
+      description: State of the pool.
+      type: str
+      returned: always
+      sample: 'present'
+    storage:
+      description: Storage members of the pool.
+      type: list
+      elements: str
+      returned: if O(pools[].state=present) and O(pools[].storage) is specified or the pool is created
+    vms:
+      description: Guest members of the pool.
+      type: list
+      elements: int
+      returned: if O(pools[].state=present)
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_text
+from ..module_utils.proxmox import ProxmoxModule
+from ..module_utils.proxmox import list_to_string
+from ..module_utils.common_args import proxmox_auth_argument_spec
+from ..module_utils.common_args import proxmox_auth_required_together
+
+
+class PVEPoolModule(ProxmoxModule):
+
+    def __init__(self, module):
+        super().__init__(module)
+        self.pools = self.module.params.get('pools')
+        self.exclusive = self.module.params.get('exclusive')
+        self.allow_move = self.module.params.get('allow_move')
+
+    def get_pools(self):
+        """
+        Read all pools and their members.
+
+        Guest members are taken from the cluster resources listing, which holds the pool of every
+        guest, so the guests of all pools are known after a single request. A storage can be a
+        member of several pools, so the listing has no pool for it: the storage members are read
+        from the pools themselves, only for the pools managing their storage or being removed.
+
+        Returns:
+        - dict: Pools indexed by name, with their comment and members.
+        """
+        try:
+            pools = dict(
+                (pool['poolid'], {'comment': pool.get('comment', ''), 'vms': set(), 'storage': set()})
+                for pool in self.proxmox_api.pools.get()
+            )
+            resources = self.proxmox_api.cluster.resources.get(type='vm')
+        except Exception as e:
+            self.module.fail_json(msg=to_text(e))
+
+        for resource in resources:
+            pool = pools.get(resource.get('pool'))
+            if pool is not None:
+                pool['vms'].add(resource['vmid'])
+
+        for poolid in self._storage_pools(pools):
+            try:
+                members = self.proxmox_api.pools(poolid).get().get('members', [])
+            except Exception as e:
+                self.module.fail_json(msg=to_text(e), poolid=poolid)
+            # Storage members are listed once per node
+            pools[poolid]['storage'].update(member['storage'] for member in members if member.get('type') == 'storage')
+
+        return pools
+
+    def _storage_pools(self, existing):
+        """Return the existing pools whose storage members have to be known"""
+        return sorted(
+            pool['poolid'] for pool in self.pools
+            if pool['poolid'] in existing and (pool['state'] == 'absent' or pool['storage'] is not None)
+        )
+
+    def reconcile(self):
+        existing = self.get_pools()
+        results = [self._reconcile_pool(pool, existing.get(pool['poolid'])) for pool in self.pools]
+        return {'changed': any(result['changed'] for result in results), 'pools': results}
+
+    def _reconcile_pool(self, pool, current):
+        poolid = pool['poolid']
+        no_members = {'vms': [], 'storage': []}
+
+        if pool['state'] == 'absent':
+            if current is None:
+                return {'poolid': poolid, 'state': 'absent', 'changed': False, 'added': no_members, 'removed': no_members}
+
+            # Only empty pools can be removed
+            removed = {'vms': sorted(current['vms']), 'storage': sorted(current['storage'])}
+            self._update_pool(poolid, removed, delete=True)
+            self._delete_pool(poolid)
+            return {'poolid': poolid, 'state': 'absent', 'changed': True, 'added': no_members, 'removed': removed}
+
+        created = current is None
+        comment = None
+        if created:
+            current = {'comment': pool['comment'] or '', 'vms': set(), 'storage': set()}
+            self._create_pool(poolid, pool['comment'])
+        elif pool['comment'] is not None and pool['comment'] != current['comment']:
+            comment = pool['comment']
+
+        added = dict(no_members)
+        removed = dict(no_members)
+        for kind in ('vms', 'storage'):
+            if pool[kind] is None:
+                continue
+            added[kind] = sorted(set(pool[kind]) - current[kind])
+            if self.exclusive:
+                removed[kind] = sorted(current[kind] - set(pool[kind]))
+
+        self._update_pool(poolid, added, comment=comment)
+        self._update_pool(poolid, removed, delete=True)
+
+        result = {
+            'poolid': poolid,
+            'state': 'present',
+            'changed': created or comment is not None or any(added.values()) or any(removed.values()),
+            'comment': comment if comment is not None else current['comment'],
+            'vms': sorted((current['vms'] | set(added['vms'])) - set(removed['vms'])),
+            'added': added,
+            'removed': removed,
+        }
+        # The storage members of an existing pool are only read when they are managed
+        if created or pool['storage'] is not None:
+            result['storage'] = sorted((current['storage'] | set(added['storage'])) - set(removed['storage']))
+        return result
+
+    def _create_pool(self, poolid, comment):
+        if not self.module.check_mode:
+            try:
+                self.proxmox_api.pools.post(poolid=poolid, comment=comment)
+            except Exception as e:
+                self.module.fail_json(msg=to_text(e), poolid=poolid)
+
+    def _update_pool(self, poolid, members, comment=None, delete=False):
+        """Add or remove the members of the pool, and update its comment, in one request"""
+        if (not any(members.values()) and comment is None) or self.module.check_mode:
+            return
+
+        data = {
+            'vms': list_to_string([str(vmid) for vmid in members['vms']]) or None,
+            'storage': list_to_string(members['storage']) or None,
+            'comment': comment,
+        }
+        if delete:
+            data['delete'] = 1
+        elif self.allow_move:
+            data['allow-move'] = 1
+
+        try:
+            self.proxmox_api.pools(poolid).put(**data)
+        except Exception as e:
+            self.module.fail_json(msg=to_text(e), poolid=poolid)
+
+    def _delete_pool(self, poolid):
+        if not self.module.check_mode:
+            try:
+                self.proxmox_api.pools(poolid).delete()
+            except Exception as e:
+                self.module.fail_json(msg=to_text(e), poolid=poolid)
+
+
+def main():
+    argument_spec = proxmox_auth_argument_spec()
+    argument_spec.update(
+        pools=dict(
+            type='list',
+            elements='dict',
+            required=True,
+            options=dict(
+                poolid=dict(type='str', required=True, aliases=['name']),
+                comment=dict(type='str'),
+                vms=dict(type='list', elements='int'),
+                storage=dict(type='list', elements='str'),
+                state=dict(type='str', default='present', choices=['present', 'absent']),
+            ),
+        ),
+        exclusive=dict(type='bool', default=False),
+        allow_move=dict(type='bool', default=False),
+    )
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        required_together=proxmox_auth_required_together(),
+        supports_check_mode=True,
+    )
+
+    poolids = [pool['poolid'] for pool in module.params.get('pools')]
+    duplicates = sorted(set(poolid for poolid in poolids if poolids.count(poolid) > 1))
+    if duplicates:
+        module.fail_json(msg='Pools defined more than once: %s' % ', '.join(duplicates))
+
+    proxmox = PVEPoolModule(module)
+    result = proxmox.reconcile()
+
+    proxmox.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
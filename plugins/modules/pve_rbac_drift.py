@@ -0,0 +1,319 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024, Mikhail Vorontsov (@mephs) <mvorontsov@tuta.io>
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: pve_rbac_drift
+short_description: Compare the roles and groups of many Proxmox VE clusters
+description:
+  - Compare the roles and groups of many Proxmox VE clusters with the ones of a reference cluster.
+  - The cluster of the API connection options is the reference, the other clusters are given in O(clusters).
+  - The listings of all clusters are read concurrently, each object is normalized then reduced to a digest.
+options:
+  clusters:
+    description: List of clusters to compare with the reference cluster.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      api_host:
+        description:
+          - Nodes of the cluster, see O(api_host).
+        type: list
+        elements: str
+        required: true
+      api_password:
+        description:
+          - Password of O(clusters[].api_user).
+          - If none of O(clusters[].api_user), O(clusters[].api_password), O(clusters[].api_token_id)
+            and O(clusters[].api_token_secret) is specified, the credentials of the reference cluster are used.
+        type: str
+      api_port:
+        description:
+          - Port of the API.
+          - If not specified, O(api_port) is used.
+        type: str
+      api_token_id:
+        description: API token ID of O(clusters[].api_user).
+        type: str
+      api_token_secret:
+        description: API token secret of O(clusters[].api_user).
+        type: str
+      api_user:
+        description: User to authenticate with.
+        type: str
+      api_validate_certs:
+        description:
+          - If V(false), SSL certificates will not be validated.
+          - If not specified, O(api_validate_certs) is used.
+        type: bool
+      name:
+        description: Name of the cluster in the results.
+        type: str
+        required: true
+  objects:
+    description: Objects to compare.
+    type: list
+    elements: str
+    choices: ['roles', 'groups']
+    default: ['roles', 'groups']
+  reference_name:
+    description: Name of the reference cluster in the results.
+    type: str
+    default: reference
+notes:
+  - The other clusters always use the V(https) backend.
+  - Group members are compared, so the users of the clusters are expected to have the same IDs.
+extends_documentation_fragment:
+  - mephs.proxmox.api_auth
+  - mephs.proxmox.attributes
+  - mephs.proxmox.attributes.info_module
+author:
+  - Mikhail Vorontsov (@mephs)
+'''
+
+EXAMPLES = r'''
+- name: Compare the roles and groups of the clusters
+  mephs.proxmox.pve_rbac_drift:
+    reference_name: prod-eu
+    clusters:
+      - name: prod-us
+        api_host: [us-node1, us-node2]
+      - name: staging
+        api_host: staging-node1
+        api_user: audit@pve
+        api_token_id: drift
+        api_token_secret: "{{ staging_token }}"
+    api_host: [eu-node1, eu-node2]
+    api_user: root@pam
+    api_password: Secret123
+  register: _drift
+
+- name: Fail on drift
+  ansible.builtin.assert:
+    that: _drift.drift | length == 0
+    fail_msg: "{{ _drift.drift | map(attribute='object') | list }}"
+'''
+
+RETURN = r'''
+clusters:
+  description: Names of the clusters, the reference cluster first.
+  type: list
+  elements: str
+  returned: always
+  sample: ['prod-eu', 'prod-us', 'staging']
+drift:
+  description: Objects that differ from the reference cluster on at least one cluster.
+  type: list
+  elements: dict
+  returned: always
+  contains:
+    differs:
+      description: Clusters where the object differs from the reference cluster.
+      type: list
+      elements: str
+      returned: always
+    missing:
+      description: Clusters where the object does not exist.
+      type: list
+      elements: str
+      returned: always
+    object:
+      description: Kind and ID of the object.
+      type: str
+      returned: always
+      sample: 'role/Auditor'
+    values:
+      description: Normalized object on each cluster, V(null) where it does not exist.
+      type: dict
+      returned: always
+      sample: {'prod-eu': {'privs': ['Sys.Audit'], 'special': false}, 'prod-us': null, 'staging': {'privs': [], 'special': false}}
+matrix:
+  description:
+    - Digest of each object on each cluster, V(null) where it does not exist.
+    - Objects are identified by their kind and ID, for example C(role/Auditor) or C(group/admins).
+  type: dict
+  returned: always
+  sample: {'role/Auditor': {'prod-eu': '3f2a9c01d4', 'prod-us': null, 'staging': '8b1e77a2c0'}}
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_bytes
+from ansible.module_utils.common.text.converters import to_text
+from ..module_utils.proxmox import ProxmoxModule
+from ..module_utils.proxmox import proxmox_to_ansible_bool
+from ..module_utils.proxmox import string_to_list
+from ..module_utils.common_args import proxmox_auth_argument_spec
+from ..module_utils.common_args import proxmox_auth_required_together
+
+# Clusters read at the same time
+MAX_WORKERS = 16
+
+CREDENTIAL_PARAMS = ('api_user', 'api_password', 'api_token_id', 'api_token_secret')
+
+
+class ClusterError(Exception):
+    pass
+
+
+class ClusterModule(object):
+    """Stand-in for AnsibleModule connecting ProxmoxModule to another cluster, failures are raised instead of exiting"""
+
+    def __init__(self, module, params):
+        self.params = params
+        self.check_mode = module.check_mode
+
+    def fail_json(self, msg=None, **kwargs):
+        raise ClusterError(msg)
+
+
+class PVERBACDriftModule(ProxmoxModule):
+
+    def __init__(self, module):
+        super().__init__(module)
+        self.objects = self.module.params.get('objects')
+        self.reference_name = self.module.params.get('reference_name')
+        self.clusters = self.module.params.get('clusters')
+
+        names = [self.reference_name] + [cluster['name'] for cluster in self.clusters]
+        duplicates = sorted(set(name for name in names if names.count(name) > 1))
+        if duplicates:
+            self.module.fail_json(msg='Cluster names must be unique: %s' % ', '.join(duplicates))
+
+    def _cluster_params(self, cluster):
+        params = dict(self.module.params)
+        # Credentials are inherited together, never mixed between clusters
+        if any(cluster.get(param) is not None for param in CREDENTIAL_PARAMS):
+            params.update((param, None) for param in CREDENTIAL_PARAMS)
+        params.update((param, value) for param, value in cluster.items() if value is not None and param != 'name')
+        params.update(api_backend='https', api_cassette=None)
+        return params
+
+    @staticmethod
+    def _normalize_role(role):
+        return {
+            'privs': sorted(string_to_list(role.get('privs'))),
+            'special': proxmox_to_ansible_bool(role.get('special', 0)),
+        }
+
+    @staticmethod
+    def _normalize_group(group):
+        return {
+            'comment': group.get('comment', ''),
+            'members': sorted(string_to_list(group.get('users'))),
+        }
+
+    @staticmethod
+    def _digest(value):
+        return hashlib.sha1(to_bytes(json.dumps(value, sort_keys=True))).hexdigest()[:10]
+
+    def read_cluster(self, proxmox):
+        """
+        Read the normalized objects of a cluster.
+
+        Parameters:
+        - proxmox (ProxmoxModule): The connection to the cluster.
+
+        Returns:
+        - dict: The normalized objects, indexed by kind and ID.
+        """
+        objects = {}
+        if 'roles' in self.objects:
+            for role in proxmox.iter_listing(proxmox.proxmox_api.access.roles):
+                objects['role/%s' % role['roleid']] = self._normalize_role(role)
+        if 'groups' in self.objects:
+            for group in proxmox.iter_listing(proxmox.proxmox_api.access.groups):
+                objects['group/%s' % group['groupid']] = self._normalize_group(group)
+        return objects
+
+    def _read(self, cluster):
+        """Connect to a cluster and read it, return its objects or the error"""
+        try:
+            if cluster is None:
+                return self.read_cluster(self), None
+            return self.read_cluster(ProxmoxModule(ClusterModule(self.module, self._cluster_params(cluster)))), None
+        except Exception as e:
+            return None, to_text(e)
+
+    def compare(self):
+        names = [self.reference_name] + [cluster['name'] for cluster in self.clusters]
+
+        with ThreadPoolExecutor(max_workers=min(len(names), MAX_WORKERS)) as executor:
+            results = list(executor.map(self._read, [None] + self.clusters))
+
+        errors = dict((name, error) for name, (objects, error) in zip(names, results) if error is not None)
+        if errors:
+            self.module.fail_json(msg='Unable to read clusters: %s' % ', '.join(sorted(errors)), errors=errors)
+
+        listings = dict((name, objects) for name, (objects, error) in zip(names, results))
+        reference = listings[self.reference_name]
+
+        matrix = {}
+        drift = []
+        for obj in sorted(set().union(*listings.values())):
+            digests = dict((name, self._digest(listings[name][obj]) if obj in listings[name] else None)
+                           for name in names)
+            matrix[obj] = digests
+
+            missing = [name for name in names if digests[name] is None]
+            differs = [name for name in names[1:]
+                       if digests[name] is not None and digests[name] != digests[self.reference_name]]
+            if missing or differs:
+                drift.append({
+                    'object': obj,
+                    'missing': missing,
+                    'differs': differs,
+                    'values': dict((name, listings[name].get(obj)) for name in names),
+                })
+
+        return {'clusters': names, 'matrix': matrix, 'drift': drift}
+
+
+def main():
+    argument_spec = proxmox_auth_argument_spec()
+    argument_spec.update(
+        clusters=dict(
+            type='list',
+            elements='dict',
+            required=True,
+            options=dict(
+                name=dict(type='str', required=True),
+                api_host=dict(type='list', elements='str', required=True),
+                api_port=dict(type='str'),
+                api_user=dict(type='str'),
+                api_password=dict(type='str', no_log=True),
+                api_token_id=dict(type='str', no_log=False),
+                api_token_secret=dict(type='str', no_log=True),
+                api_validate_certs=dict(type='bool'),
+            ),
+        ),
+        objects=dict(type='list', elements='str', choices=['roles', 'groups'], default=['roles', 'groups']),
+        reference_name=dict(type='str', default='reference'),
+    )
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        required_together=proxmox_auth_required_together(),
+        supports_check_mode=True,
+    )
+
+    proxmox = PVERBACDriftModule(module)
+    result = proxmox.compare()
+
+    proxmox.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024, Mikhail Vorontsov (@mephs) <mvorontsov@tuta.io>
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: pve_realm_sync
+short_description: Synchronize Proxmox VE LDAP and AD realms
+description:
+  - Synchronize the users and groups of Proxmox VE LDAP and AD realms.
+  - The synchronizations of all realms are started at once, then the module waits for all of them to finish.
+  - For more details on realm synchronization see U(https://pve.proxmox.com/wiki/User_Management#pveum_ldap_sync).
+attributes:
+  check_mode:
+    support: full
+    details:
+      - In check mode, the synchronizations run with O(dry_run=true).
+  diff_mode:
+    support: none
+options:
+  dry_run:
+    description: Only log what the synchronizations would change, without writing anything.
+    type: bool
+    default: false
+  enable_new:
+    description:
+      - Enable the newly synchronized users.
+      - If not specified, the default of the realm is used.
+    type: bool
+  realms:
+    description: List of realms to synchronize.
+    type: list
+    elements: str
+    required: true
+    aliases: ['realm']
+  remove_vanished:
+    description:
+      - What to remove for the users and groups that disappeared from the directory.
+      - V(acl) removes their ACLs, V(entry) removes the users and groups, V(properties) removes the properties
+        that are not set in the directory anymore.
+      - If not specified, the default of the realm is used.
+    type: list
+    elements: str
+    choices: ['acl', 'entry', 'properties', 'none']
+  scope:
+    description:
+      - What to synchronize.
+      - If not specified, the default of the realm is used.
+    type: str
+    choices: ['users', 'groups', 'both']
+  timeout:
+    description: Seconds to wait for the synchronizations to finish.
+    type: int
+    default: 600
+  wait:
+    description: Wait for the synchronizations to finish.
+    type: bool
+    default: true
+extends_documentation_fragment:
+  - mephs.proxmox.api_auth
+  - mephs.proxmox.attributes
+author:
+  - Mikhail Vorontsov (@mephs)
+'''
+
+EXAMPLES = r'''
+- name: Synchronize the users and groups of two realms
+  mephs.proxmox.pve_realm_sync:
+    realms:
+      - corp-ldap
+      - corp-ad
+    scope: both
+    remove_vanished:
+      - acl
+      - entry
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+
+- name: Preview a synchronization
+  mephs.proxmox.pve_realm_sync:
+    realm: corp-ldap
+    dry_run: true
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+  register: _sync
+
+- name: Show what would change
+  ansible.builtin.debug:
+    msg: "{{ _sync.tasks[0].log }}"
+'''
+
+RETURN = r'''
+tasks:
+  description: Synchronization tasks.
+  type: list
+  elements: dict
+  returned: always
+  contains:
+    exitstatus:
+      description: Exit status of the task, V(OK) on success.
+      type: str
+      returned: if O(wait=true)
+    log:
+      description: Log lines of the task.
+      type: list
+      elements: str
+      returned: if O(wait=true)
+    realm:
+      description: Realm synchronized by the task.
+      type: str
+      returned: always
+    status:
+      description: Status of the task.
+      type: str
+      returned: if O(wait=true)
+      sample: 'stopped'
+    timeout:
+      description: Whether the task was still running after O(timeout).
+      type: bool
+      returned: if O(wait=true)
+    upid:
+      description: ID of the task.
+      type: str
+      returned: always
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_text
+from ..module_utils.proxmox import ProxmoxModule
+from ..module_utils.proxmox import ProxmoxTaskWaiter
+from ..module_utils.proxmox import ansible_to_proxmox_bool
+from ..module_utils.proxmox import list_to_string
+from ..module_utils.common_args import proxmox_auth_argument_spec
+from ..module_utils.common_args import proxmox_auth_required_together
+
+
+class PVERealmSyncModule(ProxmoxModule):
+
+    def __init__(self, module):
+        super().__init__(module)
+        self.realms = self.module.params.get('realms')
+        self.dry_run = self.module.params.get('dry_run') or self.module.check_mode
+        self.wait = self.module.params.get('wait')
+        self.timeout = self.module.params.get('timeout')
+
+    def _sync_args(self):
+        remove_vanished = self.module.params.get('remove_vanished')
+        return {
+            'scope': self.module.params.get('scope'),
+            'remove-vanished': list_to_string(remove_vanished, sep=';') if remove_vanished is not None else None,
+            'enable-new': ansible_to_proxmox_bool(self.module.params.get('enable_new')),
+            'dry-run': ansible_to_proxmox_bool(self.dry_run),
+        }
+
+    def start_sync(self, realm):
+        try:
+            return self.proxmox_api.access.domains(realm).sync.post(**self._sync_args())
+        except Exception as e:
+            self.module.fail_json(msg=to_text(e), realm=realm)
+
+    def sync(self):
+        tasks = [{'realm': realm, 'upid': self.start_sync(realm)} for realm in self.realms]
+        output = {'changed': not self.dry_run, 'tasks': tasks}
+
+        if not self.wait:
+            return output
+
+        try:
+            statuses = ProxmoxTaskWaiter(self.proxmox_api, timeout=self.timeout).wait([task['upid'] for task in tasks])
+        except Exception as e:
+            self.module.fail_json(msg=to_text(e), **output)
+
+        for task in tasks:
+            status = statuses[task['upid']]
+            task.update(status=status['status'], exitstatus=status['exitstatus'], log=status['log'],
+                        timeout=status['timeout'])
+
+        failed = [task['realm'] for task in tasks if task['timeout'] or task['exitstatus'] != 'OK']
+        if failed:
+            self.module.fail_json(msg='Synchronization failed or timed out for: %s' % ', '.join(failed), **output)
+
+        return output
+
+
+def main():
+    argument_spec = proxmox_auth_argument_spec()
+    argument_spec.update(
+        realms=dict(type='list', elements='str', required=True, aliases=['realm']),
+        scope=dict(type='str', choices=['users', 'groups', 'both']),
+        remove_vanished=dict(type='list', elements='str', choices=['acl', 'entry', 'properties', 'none']),
+        enable_new=dict(type='bool'),
+        dry_run=dict(type='bool', default=False),
+        wait=dict(type='bool', default=True),
+        timeout=dict(type='int', default=600),
+    )
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        required_together=proxmox_auth_required_together(),
+        supports_check_mode=True,
+    )
+
+    proxmox = PVERealmSyncModule(module)
+    result = proxmox.sync()
+
+    proxmox.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
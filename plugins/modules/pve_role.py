@@ -32,6 +32,14 @@ options:
     required: true
     type: str
     aliases: ['roleid']
+  optimistic:
+    description:
+      - Send the create or delete request without reading the role first.
+      - If the role already exists or is already removed, the request is treated as an idempotent outcome.
+      - The role is only read when it already exists and its privileges may need an update.
+      - Has no effect in check mode.
+    type: bool
+    default: false
   privs:
     description:
       - List of Proxmox privileges assign to this role.
@@ -49,9 +57,20 @@ options:
     type: str
     choices: ['present', 'absent']
     default: present
+  validate_privs:
+    description:
+      - Validate O(privs) against the privileges known by the Proxmox VE cluster before sending any request
+        that modifies the role.
+      - Privilege names are matched case-insensitively and duplicates are removed.
+      - The privileges are read from the built-in C(Administrator) role and cached per Proxmox VE version,
+        in the private cache directory described in O(api_host_cache_ttl).
+        A list of Proxmox VE 8 privileges is used if the role cannot be read.
+    type: bool
+    default: true
 extends_documentation_fragment:
   - mephs.proxmox.api_auth
   - mephs.proxmox.attributes
+  - mephs.proxmox.journal
 author:
   - Mikhail Vorontsov (@mephs)
 '''
@@ -101,6 +120,29 @@ EXAMPLES = r'''
     api_user: root@pam
     api_password: Secret123
 
+- name: Create many roles without reading them first
+  mephs.proxmox.pve_role:
+    name: "{{ item }}"
+    state: present
+    privs: VM.Audit
+    optimistic: true
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+  loop: "{{ tenant_roles }}"
+
+- name: Create many roles, resuming the run if it is interrupted
+  mephs.proxmox.pve_role:
+    name: "{{ item.name }}"
+    privs: "{{ item.privs }}"
+    journal: /var/tmp/rbac.journal
+    run_id: "{{ rbac_release }}"
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+  loop: "{{ rbac_roles }}"
+  delegate_to: localhost
+
 - name: Remove a role
   mephs.proxmox.pve_role:
     name: new_role
@@ -111,6 +153,10 @@ EXAMPLES = r'''
 '''
 
 RETURN = r'''
+journaled:
+  description: Whether the operation was completed by a previous attempt of the run and only verified.
+  type: bool
+  returned: if O(journal) is specified
 state:
   description: State of the role.
   type: str
@@ -138,9 +184,15 @@ from ..module_utils.proxmox import ProxmoxModule
 from ..module_utils.proxmox import ansible_to_proxmox_bool
 from ..module_utils.proxmox import check_list_match
 from ..module_utils.proxmox import check_list_equal
+from ..module_utils.proxmox import is_already_exists_error
+from ..module_utils.proxmox import is_does_not_exist_error
 from ..module_utils.proxmox import list_to_string
+from ..module_utils.proxmox import string_to_list
+from ..module_utils.journal import Journal
+from ..module_utils.journal import JournalError
+from ..module_utils.privileges import get_privilege_catalog
+from ..module_utils.privileges import normalize_privileges
 from ..module_utils.common_args import proxmox_auth_argument_spec
-from ..module_utils.common_args import proxmox_auth_required_one_of
 from ..module_utils.common_args import proxmox_auth_required_together
 
 
@@ -151,9 +203,31 @@ class PVERoleModule(ProxmoxModule):
         self.roleid = self.module.params.get('name')
         self.privs = self.module.params.get('privs')
         self.append = self.module.params.get('append')
+        self.optimistic = self.module.params.get('optimistic') and not self.module.check_mode
         self.state = self.module.params.get('state')
+        self.journal = None
+
+        if self.module.params.get('journal'):
+            self.require_cache_dir()
+            self.journal = Journal(self.module.params.get('journal'), self.module.params.get('run_id'),
+                                   self.api_endpoint())
+
+        if self.module.params.get('validate_privs') and self.state == 'present':
+            self.privs = self._validate_privs(self.privs)
+
+    def _validate_privs(self, privs):
+        self.require_cache_dir()
+        catalog = get_privilege_catalog(self.proxmox_api, self.proxmox_version.get('version'))
+        privs, unknown = normalize_privileges(privs, catalog)
 
-    def generate_output(self, changed=False):
+        if unknown:
+            hints = ['%s (did you mean %s?)' % (priv, ', '.join(matches)) if matches else priv
+                     for priv, matches in unknown.items()]
+            self.module.fail_json(msg='Unknown privileges: %s' % '; '.join(hints), roleid=self.roleid)
+
+        return privs
+
+    def generate_output(self, changed=False, privs=None):
         """
         Generate a structured output dictionary.
 
@@ -163,13 +237,69 @@ class PVERoleModule(ProxmoxModule):
 
         Parameters:
         - changed (bool): A flag indicating whether the role was changed. Defaults to False.
+        - privs (list): The privileges of the role. Read from the API if not provided.
 
         Returns:
         - dict: A dictionary containing the role state, change status, and details.
         """
         output = {'changed': changed, 'state': self.state, 'role': {'roleid': self.roleid}}
         if self.state == 'present':
-            output['role'].update(privs=self.get_role(self.roleid).keys())
+            if privs is None:
+                privs = self.get_role(self.roleid).keys()
+            output['role'].update(privs=list(privs))
+        return output
+
+    def _journal_spec(self):
+        if self.state == 'absent':
+            return {'state': self.state}
+        return {'state': self.state, 'privs': sorted(self.privs), 'append': self.append}
+
+    def resume_role(self):
+        """
+        Verify an operation completed by a previous attempt of the run.
+
+        Returns:
+        - dict: The output of the operation, or None if it has to be applied.
+        """
+        if self.journal is None or not self.journal.is_completed('role', self.roleid, self._journal_spec()):
+            return None
+
+        try:
+            roles = self.journal.listing('roles', lambda: dict(
+                (role['roleid'], string_to_list(role.get('privs'))) for role in self.proxmox_api.access.roles.get()
+            ))
+        except Exception as e:
+            self.module.fail_json(msg=to_text(e), roleid=self.roleid)
+
+        privs = roles.get(self.roleid)
+        if self.state == 'absent':
+            verified = privs is None
+        elif privs is None:
+            verified = False
+        elif self.append:
+            verified = check_list_match(self.privs, privs)
+        else:
+            verified = check_list_equal(self.privs, privs)
+
+        if not verified:
+            return None
+
+        output = self.generate_output(changed=False, privs=privs)
+        output['journaled'] = True
+        return output
+
+    def checkpoint_role(self, output):
+        """Journal the completed operation"""
+        if self.journal is None:
+            return output
+
+        if not self.module.check_mode and not output.get('journaled'):
+            try:
+                self.journal.record('role', self.roleid, self._journal_spec(), output['changed'])
+            except JournalError as e:
+                self.module.fail_json(msg=to_text(e), roleid=self.roleid)
+
+        output.setdefault('journaled', False)
         return output
 
     def get_role(self, roleid):
@@ -181,6 +311,11 @@ class PVERoleModule(ProxmoxModule):
             self.module.fail_json(roleid=roleid, msg=to_text(e))
 
     def present_role(self):
+        if self.optimistic:
+            created = self._try_create_role()
+            if created is not None:
+                return created
+
         role = self.get_role(self.roleid)
 
         if role is None:
@@ -194,7 +329,7 @@ class PVERoleModule(ProxmoxModule):
         if update:
             return self._update_role()
 
-        return self.generate_output(changed=False)
+        return self.generate_output(changed=False, privs=role.keys())
 
     def _create_role(self):
         if not self.module.check_mode:
@@ -203,7 +338,18 @@ class PVERoleModule(ProxmoxModule):
             except Exception as e:
                 self.module.fail_json(msg=to_text(e), roleid=self.roleid)
 
-        return self.generate_output(changed=True)
+        return self.generate_output(changed=True, privs=self.privs)
+
+    def _try_create_role(self):
+        """Create the role without reading it first, return None if it already exists"""
+        try:
+            self.proxmox_api.access.roles.post(roleid=self.roleid, privs=list_to_string(self.privs))
+        except Exception as e:
+            if is_already_exists_error(e):
+                return None
+            self.module.fail_json(msg=to_text(e), roleid=self.roleid)
+
+        return self.generate_output(changed=True, privs=self.privs)
 
     def _update_role(self):
         if not self.module.check_mode:
@@ -218,6 +364,9 @@ class PVERoleModule(ProxmoxModule):
         return self.generate_output(changed=True)
 
     def absent_role(self):
+        if self.optimistic:
+            return self._try_delete_role()
+
         role = self.get_role(self.roleid)
 
         if role is not None:
@@ -231,6 +380,17 @@ class PVERoleModule(ProxmoxModule):
 
         return self.generate_output(changed=False)
 
+    def _try_delete_role(self):
+        """Delete the role without reading it first"""
+        try:
+            self.proxmox_api.access.roles(self.roleid).delete()
+        except Exception as e:
+            if is_does_not_exist_error(e):
+                return self.generate_output(changed=False)
+            self.module.fail_json(msg=to_text(e), roleid=self.roleid)
+
+        return self.generate_output(changed=True)
+
 
 def main():
     argument_spec = proxmox_auth_argument_spec()
@@ -238,25 +398,33 @@ def main():
         name=dict(type='str', required=True, aliases=['roleid']),
         privs=dict(type='list', elements='str', default=[], aliases=['priv']),
         append=dict(type='bool', default=False),
+        optimistic=dict(type='bool', default=False),
         state=dict(type='str', default='present', choices=['present', 'absent']),
+        validate_privs=dict(type='bool', default=True),
+        journal=dict(type='path'),
+        run_id=dict(type='str'),
     )
 
     module = AnsibleModule(
         argument_spec=argument_spec,
-        required_one_of=proxmox_auth_required_one_of(),
-        required_together=proxmox_auth_required_together(),
+        required_together=proxmox_auth_required_together() + [('journal', 'run_id')],
         supports_check_mode=True,
     )
 
     proxmox = PVERoleModule(module)
     state = module.params.get('state')
 
-    if state == "absent":
-        result = proxmox.absent_role()
-    else:
-        result = proxmox.present_role()
+    result = proxmox.resume_role()
+
+    if result is None:
+        if state == "absent":
+            result = proxmox.absent_role()
+        else:
+            result = proxmox.present_role()
+
+    result = proxmox.checkpoint_role(result)
 
-    module.exit_json(**result)
+    proxmox.exit_json(**result)
 
 
 if __name__ == '__main__':
@@ -16,6 +16,12 @@ short_description: Retrieve information about Proxmox VE roles
 description:
   - Retrieve information about Proxmox VE roles.
 options:
+  indexes:
+    description:
+      - Also return reverse indexes computed from the list of roles, see RV(roles_by_priv).
+      - Only applies if O(name) is not specified.
+    type: bool
+    default: false
   name:
     description: Name of the role to be retrieved.
     type: str
@@ -43,6 +49,18 @@ EXAMPLES = r'''
     api_user: root@pam
     api_password: Secret123
   register: _custom_role_details
+
+- name: Get the roles holding a privilege
+  mephs.proxmox.pve_role_info:
+    indexes: true
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+  register: _proxmox_roles
+
+- name: Show the roles allowing console access
+  ansible.builtin.debug:
+    msg: "{{ _proxmox_roles.roles_by_priv['VM.Console'] }}"
 '''
 
 RETURN = r'''
@@ -71,6 +89,11 @@ roles:
         - Returns if O(name) is not specified.
       returned: on success
       type: bool
+roles_by_priv:
+  description: Names of the roles holding each privilege.
+  type: dict
+  returned: if O(indexes=true) and O(name) is not specified
+  sample: {'VM.Console': ['Administrator', 'PVEVMAdmin', 'PVEVMUser']}
 '''
 
 from ansible.module_utils.basic import AnsibleModule
@@ -79,7 +102,6 @@ from ..module_utils.proxmox import ProxmoxModule
 from ..module_utils.proxmox import proxmox_to_ansible_bool
 from ..module_utils.proxmox import string_to_list
 from ..module_utils.common_args import proxmox_auth_argument_spec
-from ..module_utils.common_args import proxmox_auth_required_one_of
 from ..module_utils.common_args import proxmox_auth_required_together
 
 
@@ -87,6 +109,7 @@ class PVERoleInfoModule(ProxmoxModule):
 
     def __init__(self, module):
         super().__init__(module)
+        self.indexes = self.module.params.get('indexes')
 
     @staticmethod
     def generate_output(roleid=None, privs=None, roles=None):
@@ -122,11 +145,24 @@ class PVERoleInfoModule(ProxmoxModule):
 
     def get_all_roles(self):
         try:
-            roles = self.proxmox_api.access.roles.get()
-            return self.generate_output(roles=[self._ansible_format(role) for role in roles])
+            roles = [self._ansible_format(role) for role in self.iter_listing(self.proxmox_api.access.roles)]
         except Exception as e:
             self.module.fail_json(msg=to_text(e))
 
+        output = self.generate_output(roles=roles)
+        if self.indexes:
+            output['roles_by_priv'] = self._index_privs(roles)
+        return output
+
+    @staticmethod
+    def _index_privs(roles):
+        """Map each privilege to the roles holding it"""
+        index = {}
+        for role in roles:
+            for priv in role.get('privs', []):
+                index.setdefault(priv, []).append(role['roleid'])
+        return dict((priv, sorted(roleids)) for priv, roleids in index.items())
+
     @staticmethod
     def _ansible_format(role):
         if 'special' in role:
@@ -140,12 +176,12 @@ class PVERoleInfoModule(ProxmoxModule):
 def main():
     argument_spec = proxmox_auth_argument_spec()
     argument_spec.update(
-        name=dict(type='str', aliases=['roleid'])
+        name=dict(type='str', aliases=['roleid']),
+        indexes=dict(type='bool', default=False),
     )
 
     module = AnsibleModule(
         argument_spec=argument_spec,
-        required_one_of=proxmox_auth_required_one_of(),
         required_together=proxmox_auth_required_together(),
         supports_check_mode=True,
     )
@@ -158,7 +194,7 @@ def main():
     else:
         result = proxmox.get_all_roles()
 
-    module.exit_json(**result)
+    proxmox.exit_json(**result)
 
 
 if __name__ == '__main__':
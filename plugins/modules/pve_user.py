@@ -0,0 +1,344 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024, Mikhail Vorontsov (@mephs) <mvorontsov@tuta.io>
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: pve_user
+short_description: Manage Proxmox VE users
+description:
+  - Allows to create, modify or remove many Proxmox VE users at once.
+  - All the users are read with a single listing, only the users that differ are written.
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: none
+options:
+  exclusive_realm:
+    description:
+      - Remove the users of this realm that are not defined in O(users).
+      - The V(root@pam) user and the user of the API connection are never removed.
+    type: str
+  users:
+    description: List of users to manage.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      comment:
+        description:
+          - Comment of the user.
+          - If not specified, the comment is not managed.
+        type: str
+      email:
+        description:
+          - Email address of the user.
+          - If not specified, the email address is not managed.
+        type: str
+      enable:
+        description:
+          - Whether the user is enabled.
+          - If not specified, the flag is not managed.
+        type: bool
+      expire:
+        description:
+          - Expiration date of the user, in seconds since epoch.
+          - V(0) means no expiration date.
+          - If not specified, the expiration date is not managed.
+        type: int
+      firstname:
+        description:
+          - First name of the user.
+          - If not specified, the first name is not managed.
+        type: str
+      groups:
+        description:
+          - List of groups of the user, the user is removed from the groups not listed.
+          - If not specified, the groups are not managed.
+        type: list
+        elements: str
+      lastname:
+        description:
+          - Last name of the user.
+          - If not specified, the last name is not managed.
+        type: str
+      password:
+        description:
+          - Initial password of the user, only used when the user is created.
+          - Only applies to the users of the V(pve) realm.
+        type: str
+      state:
+        description:
+          - If V(present) and the user does not exist, creates it.
+          - If V(present) and the user exists, does nothing or updates it.
+          - If V(absent), removes the user.
+        type: str
+        choices: ['present', 'absent']
+        default: present
+      userid:
+        description: User ID, in the C(name@realm) format.
+        type: str
+        required: true
+        aliases: ['name']
+extends_documentation_fragment:
+  - mephs.proxmox.api_auth
+  - mephs.proxmox.attributes
+author:
+  - Mikhail Vorontsov (@mephs)
+'''
+
+EXAMPLES = r'''
+- name: Manage users
+  mephs.proxmox.pve_user:
+    users:
+      - userid: alice@pve
+        email: alice@example.com
+        groups:
+          - admins
+      - userid: bob@pve
+        expire: 1767225600
+        enable: false
+      - userid: carol@pam
+        state: absent
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+
+- name: Keep only the given users of the pve realm
+  mephs.proxmox.pve_user:
+    users:
+      - userid: alice@pve
+      - userid: bob@pve
+    exclusive_realm: pve
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+'''
+
+RETURN = r'''
+users:
+  description: Users current status.
+  type: list
+  elements: dict
+  returned: always
+  contains:
+    changed:
+      description: Whether the user was changed.
+      type: bool
+      returned: always
+    comment:
+      description: Comment of the user.
+      type: str
+      returned: if O(users[].state=present)
+    email:
+      description: Email address of the user.
+      type: str
+      returned: if O(users[].state=present)
+    enable:
+      description: Whether the user is enabled.
+      type: bool
+      returned: if O(users[].state=present)
+    expire:
+      description: Expiration date of the user.
+      type: int
+      returned: if O(users[].state=present)
+    firstname:
+      description: First name of the user.
+      type: str
+      returned: if O(users[].state=present)
+    groups:
+      description: Groups of the user.
+      type: list
+      elements: str
+      returned: if O(users[].state=present)
+    lastname:
+      description: Last name of the user.
+      type: str
+      returned: if O(users[].state=present)
+    state:
+      description: State of the user.
+      type: str
+      returned: always
+      sample: 'present'
+    userid:
+      description: User ID.
+      type: str
+      returned: always
+      sample: 'alice@pve'
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_text
+from ..module_utils.proxmox import ProxmoxModule
+from ..module_utils.proxmox import ansible_to_proxmox_bool
+from ..module_utils.proxmox import check_list_equal
+from ..module_utils.proxmox import list_to_string
+from ..module_utils.proxmox import proxmox_to_ansible_bool
+from ..module_utils.proxmox import string_to_list
+from ..module_utils.common_args import proxmox_auth_argument_spec
+from ..module_utils.common_args import proxmox_auth_required_together
+
+USER_FIELDS = ('comment', 'email', 'enable', 'expire', 'firstname', 'groups', 'lastname')
+PROTECTED_USERS = ('root@pam',)
+
+
+class PVEUserModule(ProxmoxModule):
+
+    def __init__(self, module):
+        super().__init__(module)
+        self.users = self.module.params.get('users')
+        self.exclusive_realm = self.module.params.get('exclusive_realm')
+
+    def get_users(self):
+        """
+        Read all users with a single listing.
+
+        Returns:
+        - dict: Users indexed by user ID.
+        """
+        try:
+            return dict((user['userid'], self._ansible_format(user))
+                        for user in self.iter_listing(self.proxmox_api.access.users, full=1))
+        except Exception as e:
+            self.module.fail_json(msg=to_text(e))
+
+    @staticmethod
+    def _ansible_format(user):
+        groups = user.get('groups') or []
+        return {
+            'comment': user.get('comment', ''),
+            'email': user.get('email', ''),
+            'enable': proxmox_to_ansible_bool(int(user.get('enable', 1))),
+            'expire': int(user.get('expire', 0)),
+            'firstname': user.get('firstname', ''),
+            'groups': sorted(groups if isinstance(groups, list) else string_to_list(groups)),
+            'lastname': user.get('lastname', ''),
+        }
+
+    @staticmethod
+    def _proxmox_format(fields):
+        fields = dict(fields)
+        if 'enable' in fields:
+            fields['enable'] = ansible_to_proxmox_bool(fields['enable'])
+        if 'groups' in fields:
+            fields['groups'] = list_to_string(fields['groups'])
+        return fields
+
+    def reconcile(self):
+        existing = self.get_users()
+
+        results = [self._reconcile_user(user, existing.get(user['userid'])) for user in self.users]
+
+        if self.exclusive_realm:
+            defined = set(user['userid'] for user in self.users)
+            protected = set(PROTECTED_USERS + (self.module.params.get('api_user'),))
+            for userid in sorted(existing):
+                if (userid.rsplit('@', 1)[-1] == self.exclusive_realm
+                        and userid not in defined and userid not in protected):
+                    results.append(self._reconcile_user({'userid': userid, 'state': 'absent'}, existing[userid]))
+
+        return {'changed': any(result['changed'] for result in results), 'users': results}
+
+    def _reconcile_user(self, user, current):
+        userid = user['userid']
+        result = {'userid': userid, 'state': user['state']}
+
+        if user['state'] == 'absent':
+            if userid in PROTECTED_USERS:
+                self.module.fail_json(msg='User %s cannot be removed' % userid)
+            if current is not None:
+                self._delete_user(userid)
+            result['changed'] = current is not None
+            return result
+
+        desired = dict((field, user[field]) for field in USER_FIELDS if user.get(field) is not None)
+
+        if current is None:
+            self._create_user(userid, desired, user.get('password'))
+            result.update(self._ansible_format({}))
+            result.update(desired)
+            result['changed'] = True
+            return result
+
+        update = dict((field, value) for field, value in desired.items() if not self._equal(field, current[field], value))
+        if update:
+            self._update_user(userid, update)
+
+        result.update(current)
+        result.update(update)
+        result['changed'] = bool(update)
+        return result
+
+    @staticmethod
+    def _equal(field, current, desired):
+        if field == 'groups':
+            return check_list_equal(current, desired)
+        return current == desired
+
+    def _create_user(self, userid, fields, password=None):
+        if not self.module.check_mode:
+            try:
+                self.proxmox_api.access.users.post(userid=userid, password=password, **self._proxmox_format(fields))
+            except Exception as e:
+                self.module.fail_json(msg=to_text(e), userid=userid)
+
+    def _update_user(self, userid, fields):
+        if not self.module.check_mode:
+            try:
+                self.proxmox_api.access.users(userid).put(**self._proxmox_format(fields))
+            except Exception as e:
+                self.module.fail_json(msg=to_text(e), userid=userid)
+
+    def _delete_user(self, userid):
+        if not self.module.check_mode:
+            try:
+                self.proxmox_api.access.users(userid).delete()
+            except Exception as e:
+                self.module.fail_json(msg=to_text(e), userid=userid)
+
+
+def main():
+    argument_spec = proxmox_auth_argument_spec()
+    argument_spec.update(
+        users=dict(
+            type='list',
+            elements='dict',
+            required=True,
+            options=dict(
+                userid=dict(type='str', required=True, aliases=['name']),
+                comment=dict(type='str'),
+                email=dict(type='str'),
+                enable=dict(type='bool'),
+                expire=dict(type='int'),
+                firstname=dict(type='str'),
+                groups=dict(type='list', elements='str'),
+                lastname=dict(type='str'),
+                password=dict(type='str', no_log=True),
+                state=dict(type='str', default='present', choices=['present', 'absent']),
+            ),
+        ),
+        exclusive_realm=dict(type='str'),
+    )
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        required_together=proxmox_auth_required_together(),
+        supports_check_mode=True,
+    )
+
+    proxmox = PVEUserModule(module)
+    result = proxmox.reconcile()
+
+    proxmox.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,372 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024, Mikhail Vorontsov (@mephs) <mvorontsov@tuta.io>
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+module: pve_user_token
+short_description: Manage Proxmox VE API tokens
+description:
+  - Allows to create, modify or remove many Proxmox VE API tokens at once.
+  - The tokens of all users are read with a single listing, only the tokens that differ are written.
+  - The secrets of the created tokens are written to O(secrets_file) and never returned by the module.
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: none
+options:
+  exclusive:
+    description: Remove the tokens of the users listed in O(tokens) that are not defined in O(tokens).
+    type: bool
+    default: false
+  secrets_file:
+    description:
+      - Path of the JSON file the secrets of the created tokens are written to, on the host running the module.
+      - The file maps the full token IDs to their secrets, existing entries are kept.
+      - The file is only readable by its owner.
+      - Required if a token has to be created.
+    type: path
+  tokens:
+    description: List of tokens to manage.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      comment:
+        description:
+          - Comment of the token.
+          - If not specified, the comment is not managed.
+        type: str
+      expire:
+        description:
+          - Expiration date of the token, in seconds since epoch.
+          - V(0) means no expiration date.
+          - If not specified, the expiration date is not managed.
+        type: int
+      privsep:
+        description:
+          - Restrict the token privileges with separate ACLs, instead of giving it the full privileges of the user.
+          - If not specified, the privileges separation is not managed.
+        type: bool
+      state:
+        description:
+          - If V(present) and the token does not exist, creates it.
+          - If V(present) and the token exists, does nothing or updates it.
+          - If V(absent), removes the token.
+        type: str
+        choices: ['present', 'absent']
+        default: present
+      tokenid:
+        description: Name of the token.
+        type: str
+        required: true
+        aliases: ['name']
+      userid:
+        description: User owning the token, in the C(name@realm) format.
+        type: str
+        required: true
+extends_documentation_fragment:
+  - mephs.proxmox.api_auth
+  - mephs.proxmox.attributes
+author:
+  - Mikhail Vorontsov (@mephs)
+'''
+
+EXAMPLES = r'''
+- name: Create tokens for automation users
+  mephs.proxmox.pve_user_token:
+    tokens:
+      - userid: backup@pve
+        tokenid: service
+        comment: Backup service
+        privsep: true
+      - userid: monitoring@pve
+        tokenid: service
+        expire: 1767225600
+    secrets_file: /root/.pve_tokens.json
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+  delegate_to: localhost
+
+- name: Keep only the given tokens of a user
+  mephs.proxmox.pve_user_token:
+    tokens:
+      - userid: backup@pve
+        tokenid: service
+    exclusive: true
+    secrets_file: /root/.pve_tokens.json
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+  delegate_to: localhost
+
+- name: Remove a token
+  mephs.proxmox.pve_user_token:
+    tokens:
+      - userid: monitoring@pve
+        tokenid: service
+        state: absent
+    api_host: node1
+    api_user: root@pam
+    api_password: Secret123
+'''
+
+RETURN = r'''
+tokens:
+  description: Tokens current status, without their secrets.
+  type: list
+  elements: dict
+  returned: always
+  contains:
+    changed:
+      description: Whether the token was changed.
+      type: bool
+      returned: always
+    comment:
+      description: Comment of the token.
+      type: str
+      returned: if O(tokens[].state=present)
+    expire:
+      description: Expiration date of the token.
+      type: int
+      returned: if O(tokens[].state=present)
+    full_tokenid:
+      description: Token ID used for authentication, in the C(name@realm!token) format.
+      type: str
+      returned: always
+      sample: 'backup@pve!service'
+    privsep:
+      description: Whether the token privileges are separated.
+      type: bool
+      returned: if O(tokens[].state=present)
+    state:
+      description: State of the token.
+      type: str
+      returned: always
+      sample: 'present'
+    tokenid:
+      description: Token name.
+      type: str
+      returned: always
+    userid:
+      description: User owning the token.
+      type: str
+      returned: always
+secrets_file:
+  description: Path of the file the new secrets were written to.
+  type: str
+  returned: when tokens were created
+'''
+
+import json
+import os
+import tempfile
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.text.converters import to_text
+from ..module_utils.proxmox import ProxmoxModule
+from ..module_utils.proxmox import ansible_to_proxmox_bool
+from ..module_utils.proxmox import proxmox_to_ansible_bool
+from ..module_utils.common_args import proxmox_auth_argument_spec
+from ..module_utils.common_args import proxmox_auth_required_together
+
+TOKEN_FIELDS = ('comment', 'expire', 'privsep')
+
+
+class PVEUserTokenModule(ProxmoxModule):
+
+    def __init__(self, module):
+        super().__init__(module)
+        self.tokens = self.module.params.get('tokens')
+        self.exclusive = self.module.params.get('exclusive')
+        self.secrets_file = self.module.params.get('secrets_file')
+        self.secrets_written = False
+
+    def get_tokens(self):
+        """
+        Read the tokens of all users with a single listing.
+
+        Returns:
+        - dict: Tokens indexed by user, then by token name.
+        """
+        try:
+            users = self.proxmox_api.access.users.get(full=1)
+        except Exception as e:
+            self.module.fail_json(msg=to_text(e))
+
+        return dict(
+            (user['userid'], dict((token['tokenid'], self._ansible_format(token)) for token in user.get('tokens') or []))
+            for user in users
+        )
+
+    @staticmethod
+    def _ansible_format(token):
+        return {
+            'comment': token.get('comment', ''),
+            'expire': int(token.get('expire', 0)),
+            'privsep': proxmox_to_ansible_bool(int(token.get('privsep', 1))),
+        }
+
+    def reconcile(self):
+        existing = self.get_tokens()
+
+        missing_users = sorted(set(token['userid'] for token in self.tokens) - set(existing))
+        if missing_users:
+            self.module.fail_json(msg='Users do not exist: %s' % ', '.join(missing_users))
+
+        to_create = [token for token in self.tokens
+                     if token['state'] == 'present' and token['tokenid'] not in existing[token['userid']]]
+        if to_create and not self.secrets_file and not self.module.check_mode:
+            self.module.fail_json(msg='secrets_file is required to create tokens: %s' % ', '.join(
+                self._full_tokenid(token['userid'], token['tokenid']) for token in to_create))
+
+        results = [self._reconcile_token(token, existing[token['userid']].get(token['tokenid']))
+                   for token in self.tokens]
+
+        if self.exclusive:
+            defined = set((token['userid'], token['tokenid']) for token in self.tokens)
+            for userid in sorted(set(token['userid'] for token in self.tokens)):
+                for tokenid in sorted(existing[userid]):
+                    if (userid, tokenid) not in defined:
+                        results.append(self._reconcile_token(
+                            {'userid': userid, 'tokenid': tokenid, 'state': 'absent'}, existing[userid][tokenid]))
+
+        output = {'changed': any(result['changed'] for result in results), 'tokens': results}
+        if self.secrets_written:
+            output['secrets_file'] = self.secrets_file
+        return output
+
+    @staticmethod
+    def _full_tokenid(userid, tokenid):
+        return '%s!%s' % (userid, tokenid)
+
+    def _reconcile_token(self, token, current):
+        userid, tokenid = token['userid'], token['tokenid']
+        result = {'userid': userid, 'tokenid': tokenid, 'full_tokenid': self._full_tokenid(userid, tokenid),
+                  'state': token['state']}
+
+        if token['state'] == 'absent':
+            if current is not None:
+                self._delete_token(userid, tokenid)
+            result['changed'] = current is not None
+            return result
+
+        desired = dict((field, token[field]) for field in TOKEN_FIELDS if token.get(field) is not None)
+
+        if current is None:
+            result.update(self._ansible_format(self._create_token(userid, tokenid, desired)))
+            result['changed'] = True
+            return result
+
+        update = dict((field, value) for field, value in desired.items() if current[field] != value)
+        if update:
+            self._update_token(userid, tokenid, update)
+
+        result.update(current)
+        result.update(update)
+        result['changed'] = bool(update)
+        return result
+
+    @staticmethod
+    def _proxmox_format(fields):
+        fields = dict(fields)
+        if 'privsep' in fields:
+            fields['privsep'] = ansible_to_proxmox_bool(fields['privsep'])
+        return fields
+
+    def _create_token(self, userid, tokenid, fields):
+        """Create the token, return its settings as reported by the API"""
+        fields = self._proxmox_format(fields)
+        if self.module.check_mode:
+            return fields
+
+        try:
+            created = self.proxmox_api.access.users(userid).token(tokenid).post(**fields)
+        except Exception as e:
+            self.module.fail_json(msg=to_text(e), userid=userid, tokenid=tokenid)
+
+        # A write deduplicated by api_single_flight returns no data, its secret was saved by the task that sent it
+        if not created:
+            return fields
+
+        # Written right away, so the secrets of the tokens already created survive a later failure
+        self._write_secret(created['full-tokenid'], created['value'])
+        return created.get('info', fields)
+
+    def _update_token(self, userid, tokenid, fields):
+        if not self.module.check_mode:
+            try:
+                self.proxmox_api.access.users(userid).token(tokenid).put(**self._proxmox_format(fields))
+            except Exception as e:
+                self.module.fail_json(msg=to_text(e), userid=userid, tokenid=tokenid)
+
+    def _delete_token(self, userid, tokenid):
+        if not self.module.check_mode:
+            try:
+                self.proxmox_api.access.users(userid).token(tokenid).delete()
+            except Exception as e:
+                self.module.fail_json(msg=to_text(e), userid=userid, tokenid=tokenid)
+
+    def _write_secret(self, full_tokenid, secret):
+        secrets = {}
+        if os.path.exists(self.secrets_file):
+            try:
+                with open(self.secrets_file) as f:
+                    secrets = json.load(f)
+            except (IOError, OSError, ValueError) as e:
+                self.module.fail_json(msg='Unable to read %s: %s' % (self.secrets_file, to_text(e)))
+
+        secrets[full_tokenid] = secret
+
+        directory = os.path.dirname(os.path.abspath(self.secrets_file))
+        # mkstemp creates the file readable by its owner only
+        fd, tmp = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(secrets, f, indent=2, sort_keys=True)
+        os.rename(tmp, self.secrets_file)
+        self.secrets_written = True
+
+
+def main():
+    argument_spec = proxmox_auth_argument_spec()
+    argument_spec.update(
+        tokens=dict(
+            type='list',
+            elements='dict',
+            required=True,
+            options=dict(
+                userid=dict(type='str', required=True),
+                tokenid=dict(type='str', required=True, aliases=['name']),
+                comment=dict(type='str'),
+                expire=dict(type='int'),
+                privsep=dict(type='bool'),
+                state=dict(type='str', default='present', choices=['present', 'absent']),
+            ),
+        ),
+        exclusive=dict(type='bool', default=False),
+        secrets_file=dict(type='path'),
+    )
+
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        required_together=proxmox_auth_required_together(),
+        supports_check_mode=True,
+    )
+
+    proxmox = PVEUserTokenModule(module)
+    result = proxmox.reconcile()
+
+    proxmox.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2024, Mikhail Vorontsov (@mephs) <mvorontsov@tuta.io>
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+import pytest
+
+from ansible_collections.mephs.proxmox.plugins.module_utils.proxmox import iter_json_items
+
+LISTING = {
+    'data': [
+        {'userid': 'alice@pve', 'comment': 'nested ] and [ brackets, "quotes" and {braces}', 'expire': 0},
+        {'userid': 'bob@pve', 'groups': ['admins', 'ops'], 'tokens': [{'tokenid': 'ci', 'expire': 1735689600}]},
+        {'userid': u'zoé@pve', 'comment': u'unicode ✓ split across chunks', 'enable': 1},
+        12345678901234567890,
+        -1.5e-3,
+        'a string item, with a comma]',
+        None,
+        True,
+    ],
+}
+
+
+def split(document, size):
+    return [document[i:i + size] for i in range(0, len(document), size)]
+
+
+@pytest.mark.parametrize('size', list(range(1, 33)) + [4096])
+@pytest.mark.parametrize('separators', [(',', ':'), (', ', ': '), (',\n ', ' : ')])
+def test_items_across_chunk_boundaries(size, separators):
+    document = json.dumps(LISTING, separators=separators, ensure_ascii=False).encode('utf-8')
+    assert list(iter_json_items(split(document, size))) == LISTING['data']
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7])
+def test_number_split_across_chunks(size):
+    document = b'{"data": [1234567890, 98765, 3.14159]}'
+    assert list(iter_json_items(split(document, size))) == [1234567890, 98765, 3.14159]
+
+
+def test_array_after_other_keys():
+    document = b'{"success": 1, "errors": {"path": "[not the data]"}, "data": [{"id": 1}], "total": 1}'
+    assert list(iter_json_items(split(document, 5))) == [{'id': 1}]
+
+
+def test_empty_array():
+    assert list(iter_json_items([b'{"data": []}'])) == []
+
+
+@pytest.mark.parametrize('document', [b'{"data": null}', b'{}', b''])
+def test_no_listing(document):
+    assert list(iter_json_items([document])) == []
+
+
+@pytest.mark.parametrize('document', [b'{"data": {"node1": 1, "node2": 2}}', b'{"data": "text"}', b'{"data": 1}'])
+def test_not_an_array(document):
+    with pytest.raises(ValueError):
+        list(iter_json_items(split(document, 4)))
+
+
+@pytest.mark.parametrize('document', [b'{"data": [{"id": 1}, {"id": 2', b'{"data": [1, 2', b'{"data": [1, 23'])
+def test_truncated_array(document):
+    with pytest.raises(ValueError):
+        list(iter_json_items(split(document, 3)))
+
+
+def test_items_yielded_before_the_end():
+    chunks = iter([b'{"data": [{"id": 1}, ', b'{"id": 2}'])
+
+    items = iter_json_items(chunks)
+    assert next(items) == {'id': 1}
+    assert next(items) == {'id': 2}
+    with pytest.raises(ValueError):
+        next(items)